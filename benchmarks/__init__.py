@@ -0,0 +1,10 @@
+"""
+Benchmarks for django-crispy-forms render hot paths.
+
+Run them from the root of the repository with::
+
+    python -m benchmarks
+
+Every scenario of `benchmarks.scenarios` is measured for every template pack and
+the results are written as JSON, see `python -m benchmarks --help`.
+"""
@@ -0,0 +1,6 @@
+import sys
+
+from crispy_forms.bench.__main__ import main
+
+if __name__ == "__main__":
+    sys.exit(main(["run", "--scenarios", "benchmarks.scenarios", "--settings", "benchmarks.settings", *sys.argv[1:]]))
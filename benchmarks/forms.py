@@ -0,0 +1,27 @@
+from django import forms
+
+
+class SampleForm(forms.Form):
+    is_company = forms.CharField(label="company", required=False, widget=forms.CheckboxInput())
+    email = forms.EmailField(label="email", max_length=30, required=True, help_text="Insert your email")
+    password1 = forms.CharField(label="password", max_length=30, required=True, widget=forms.PasswordInput())
+    password2 = forms.CharField(label="re-enter password", max_length=30, required=True, widget=forms.PasswordInput())
+    first_name = forms.CharField(label="first name", max_length=30, required=True)
+    last_name = forms.CharField(label="last name", max_length=30, required=True)
+    country = forms.ChoiceField(choices=[(code, code.upper()) for code in ("es", "fr", "it", "pt", "uk")])
+    comment = forms.CharField(required=False, widget=forms.Textarea())
+
+
+class LineForm(forms.Form):
+    product = forms.CharField(max_length=30)
+    quantity = forms.IntegerField(min_value=0)
+    price = forms.DecimalField(max_digits=8, decimal_places=2)
+    delete = forms.BooleanField(required=False)
+
+
+def large_form_class(size):
+    """
+    Returns a form class with `size` char fields, named `field_0`, `field_1`...
+    """
+    fields = {"field_%s" % i: forms.CharField(required=False) for i in range(size)}
+    return type("LargeForm", (forms.Form,), fields)
@@ -0,0 +1,246 @@
+"""
+Benchmark scenarios, registered with `crispy_forms.bench.scenario`.
+
+A scenario is a function taking the template pack to use and returning the callable
+to measure. Everything done before returning that callable, like building forms and
+layouts, is left out of the measurements. Scenarios return None for template packs that
+don't support what they measure. Scenarios exercising a layout object are
+named after it.
+"""
+
+import os
+import subprocess
+import sys
+
+from django.forms import formset_factory
+from django.template import Context, Template
+
+from crispy_forms.bench import parse_import_time, scenario
+from crispy_forms.bootstrap import Accordion, AccordionGroup, Tab, TabHolder
+from crispy_forms.helper import FormHelper
+from crispy_forms.layout import HTML, Column, Div, Field, Fieldset, Layout, MultiField, Row, Submit
+from crispy_forms.utils import render_crispy_form
+
+from .forms import LineForm, SampleForm, large_form_class
+
+
+def sample_helper(template_pack):
+    helper = FormHelper()
+    helper.template_pack = template_pack
+    helper.layout = Layout(
+        Fieldset(
+            "Contact {{ title }}",
+            "is_company",
+            Row(Column("first_name"), Column("last_name")),
+            "email",
+        ),
+        Div("password1", "password2", css_class="passwords"),
+        "country",
+        HTML("<p>{{ title }}</p>"),
+        Field("comment", rows=3),
+        Submit("save", "Save"),
+    )
+    return helper
+
+
+def render_template(template_code, context):
+    template = Template("{% load crispy_forms_tags %}" + template_code)
+    return lambda: template.render(Context(context))
+
+
+@scenario("render_crispy_form")
+def render_form(template_pack):
+    helper = sample_helper(template_pack)
+    return lambda: render_crispy_form(SampleForm(), helper, {"title": "title"})
+
+
+@scenario("crispy_tag")
+def crispy_tag(template_pack):
+    helper = sample_helper(template_pack)
+    return render_template("{% crispy form helper %}", {"form": SampleForm(), "helper": helper, "title": "title"})
+
+
+@scenario("crispy_filter")
+def crispy_filter(template_pack):
+    return render_template("{{ form|crispy:'%s' }}" % template_pack, {"form": SampleForm()})
+
+
+@scenario("as_crispy_field_filter")
+def as_crispy_field_filter(template_pack):
+    return render_template(
+        "{% for field in form %}{{ field|as_crispy_field:'" + template_pack + "' }}{% endfor %}",
+        {"form": SampleForm()},
+    )
+
+
+@scenario("as_crispy_errors_filter")
+def as_crispy_errors_filter(template_pack):
+    form = SampleForm(data={"email": "invalid"})
+    form.is_valid()
+    return render_template("{{ form|as_crispy_errors:'%s' }}" % template_pack, {"form": form})
+
+
+def formset_scenario(size):
+    def formset(template_pack):
+        LineFormSet = formset_factory(LineForm, extra=size)
+        helper = FormHelper()
+        helper.template_pack = template_pack
+        helper.layout = Layout(
+            Row(Column("product"), Column("quantity"), Column("price")),
+            HTML("{% if forloop.last %}<hr>{% endif %}"),
+            "delete",
+        )
+        return lambda: render_crispy_form(LineFormSet(), helper)
+
+    return formset
+
+
+for size in (10, 100, 1000):
+    scenario("formset_%s" % size)(formset_scenario(size))
+
+
+@scenario("Fieldset")
+def fieldset(template_pack):
+    helper = FormHelper()
+    helper.template_pack = template_pack
+    helper.layout = Layout(
+        Fieldset("Account of {{ title }}", "email", "password1", "password2"),
+        Fieldset("Names", "first_name", "last_name"),
+        Fieldset("Details", "is_company", "country", "comment"),
+    )
+    return lambda: render_crispy_form(SampleForm(), helper, {"title": "title"})
+
+
+@scenario("MultiField")
+def multi_field(template_pack):
+    if template_pack != "bootstrap3":
+        # MultiField is only supported by bootstrap3
+        return None
+    helper = FormHelper()
+    helper.template_pack = template_pack
+    helper.layout = Layout(
+        MultiField("Account", "email", "password1", "password2"),
+        MultiField("Names", "first_name", "last_name"),
+    )
+    form = SampleForm(data={"email": "invalid"})
+    form.is_valid()
+    return lambda: render_crispy_form(form, helper)
+
+
+@scenario("Row_Column")
+def row_column(template_pack):
+    helper = FormHelper()
+    helper.template_pack = template_pack
+    helper.layout = Layout(
+        Row(Column("first_name"), Column("last_name")),
+        Row(Column("password1"), Column("password2")),
+        Row(Column("email"), Column("country")),
+    )
+    return lambda: render_crispy_form(SampleForm(), helper)
+
+
+@scenario("Div_nested")
+def nested_div(template_pack):
+    layout = Layout("email")
+    for depth in range(50):
+        layout = Layout(Div(*layout.fields, css_class="depth-%s" % depth))
+    helper = FormHelper()
+    helper.template_pack = template_pack
+    helper.layout = layout
+    return lambda: render_crispy_form(SampleForm(), helper)
+
+
+@scenario("TabHolder")
+def tab_holder(template_pack):
+    helper = FormHelper()
+    helper.template_pack = template_pack
+    helper.layout = Layout(
+        TabHolder(
+            Tab("Names", "first_name", "last_name"),
+            Tab("Account", "email", "password1", "password2"),
+            Tab("Details", "is_company", "country", "comment"),
+        )
+    )
+    return lambda: render_crispy_form(SampleForm(), helper)
+
+
+@scenario("Accordion")
+def accordion(template_pack):
+    helper = FormHelper()
+    helper.template_pack = template_pack
+    helper.layout = Layout(
+        Accordion(
+            AccordionGroup("Names", "first_name", "last_name"),
+            AccordionGroup("Account", "email", "password1", "password2"),
+            AccordionGroup("Details", "is_company", "country", "comment"),
+        )
+    )
+    return lambda: render_crispy_form(SampleForm(), helper)
+
+
+@scenario("large_form_500")
+def large_form(template_pack):
+    LargeForm = large_form_class(500)
+    names = list(LargeForm.base_fields)
+    helper = FormHelper()
+    helper.template_pack = template_pack
+    helper.layout = Layout(
+        Fieldset("First", *names[:200]),
+        Div(*(Field(name) for name in names[200:400])),
+        Row(*names[400:]),
+    )
+    return lambda: render_crispy_form(LargeForm(), helper)
+
+
+@scenario("dynamic_filter_wrap")
+def dynamic_filter_wrap(template_pack):
+    def run():
+        helper = FormHelper(SampleForm())
+        helper.filter(str, greedy=True).wrap(Field, css_class="dynamic")
+        return helper
+
+    return run
+
+
+@scenario("LayoutSlice_wrap")
+def layout_slice_wrap(template_pack):
+    def run():
+        helper = FormHelper(SampleForm())
+        helper[1:4].wrap(Div, css_class="wrapped")
+        helper["email"].wrap(Field, css_class="email")
+        helper[0:2].wrap_together(Fieldset, "Together")
+        return helper
+
+    return run
+
+
+@scenario("update_attributes")
+def update_attributes(template_pack):
+    def run():
+        helper = FormHelper(SampleForm())
+        helper.filter(str).wrap(Field)
+        helper.filter(Field).update_attributes(css_class="updated", data_test="value")
+        return helper
+
+    return run
+
+
+@scenario("template_tags_import", timer=True, budget=0.04)
+def template_tags_import(template_pack):
+    # Imported in a new interpreter and timed by `-X importtime`: only the time spent in
+    # crispy_forms modules is measured, leaving out the interpreter's startup and Django's
+    # setup, whose changes would hide import regressions
+    command = [
+        sys.executable,
+        "-X",
+        "importtime",
+        "-c",
+        "import django; django.setup(); import crispy_forms.templatetags.crispy_forms_tags",
+    ]
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def run():
+        result = subprocess.run(command, cwd=cwd, check=True, capture_output=True, text=True)
+        return parse_import_time(result.stderr, "crispy_forms")
+
+    return run
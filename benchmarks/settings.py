@@ -0,0 +1,18 @@
+INSTALLED_APPS = (
+    "crispy_forms",
+    "crispy_bootstrap3",
+    "crispy_bootstrap4",
+)
+
+CRISPY_ALLOWED_TEMPLATE_PACKS = ("bootstrap3", "bootstrap4")
+CRISPY_TEMPLATE_PACK = "bootstrap4"
+ROOT_URLCONF = "benchmarks.urls"
+SECRET_KEY = "benchmarks"
+USE_TZ = True
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "APP_DIRS": True,
+    },
+]
@@ -0,0 +1,203 @@
+"""
+Benchmark harness for django-crispy-forms.
+
+Scenarios are registered with the `scenario` decorator. A scenario is a function taking
+the template pack to use and returning the callable to measure, so that building forms
+and layouts is left out of the measurements, or None if the template pack doesn't support
+what the scenario measures. Scenarios are named after the layout objects
+they exercise, so that a regression points to the code to look at.
+
+`python -m crispy_forms.bench run` measures them and `python -m crispy_forms.bench compare`
+checks them against a stored baseline and their budgets, see `python -m crispy_forms.bench
+--help`. Both take the module registering the scenarios, `--scenarios`, and the Django
+settings to use, `--settings`, as scenarios aren't shipped with crispy-forms.
+"""
+
+import platform
+import statistics
+import time
+import tracemalloc
+
+SCENARIOS = {}
+
+
+def scenario(name, timer=False, budget=None):
+    """
+    Registers the decorated function as the scenario `name`.
+
+    If `timer` is set, the callable returned by the scenario times itself: it returns the
+    seconds spent on what it measures, which are used instead of the duration of the
+    call, like the time spent importing modules in a new interpreter. `budget` is the p50
+    latency, in seconds, the scenario must stay under, see `compare`.
+    """
+
+    def register(function):
+        function.timer = timer
+        function.budget = budget
+        SCENARIOS[name] = function
+        return function
+
+    return register
+
+
+def measure(function, rounds=None, min_time=1.0, timer=False):
+    """
+    Measures `function` and returns a dictionary with its `ops_per_sec`, `p50` and `p95`
+    latencies, in seconds, and `memory_peak`, the peak of memory allocated by one call,
+    in bytes. If `timer` is set, latencies are the seconds `function` returns.
+
+    `function` is called once to warm caches up. Unless a number of `rounds` is given, it's
+    then called at least 5 times and until `min_time` seconds have been spent.
+    """
+    function()
+
+    tracemalloc.start()
+    try:
+        function()
+        memory_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    spent = 0.0
+    while True:
+        start = time.perf_counter()
+        timing = function()
+        duration = time.perf_counter() - start
+        timings.append(timing if timer else duration)
+        spent += duration
+        if rounds is not None:
+            if len(timings) >= rounds:
+                break
+        elif len(timings) >= 5 and spent >= min_time:
+            break
+
+    if len(timings) > 1:
+        p95 = statistics.quantiles(timings, n=20, method="inclusive")[18]
+    else:
+        p95 = timings[0]
+    return {
+        "rounds": len(timings),
+        "ops_per_sec": len(timings) / sum(timings),
+        "p50": statistics.median(timings),
+        "p95": p95,
+        "memory_peak": memory_peak,
+    }
+
+
+def parse_import_time(output, package):
+    """
+    Returns the seconds spent importing the modules of `package`, and the modules they
+    import, from the `-X importtime` output of an interpreter. It's the sum of the
+    cumulative times of the modules of `package` that weren't imported by another one.
+    """
+    total = 0
+    # Depth of the module of `package` whose imports are being read, lines are read backwards
+    # as a module is listed after the modules it imports
+    package_depth = None
+    for line in reversed(output.splitlines()):
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            # Header line
+            continue
+        depth = len(name) - len(name.lstrip())
+        if package_depth is not None and depth > package_depth:
+            continue
+        package_depth = None
+        name = name.strip()
+        if name == package or name.startswith(package + "."):
+            total += int(cumulative)
+            package_depth = depth
+    return total / 1_000_000
+
+
+def run(names, template_packs, rounds=None, min_time=1.0, report=None):
+    """
+    Measures the scenarios `names` for every template pack and returns the results, as a
+    dictionary ready to be dumped as JSON. `report` is called with every scenario result.
+    """
+    import django
+    from django.test.utils import override_settings
+
+    import crispy_forms
+
+    results = []
+    for template_pack in template_packs:
+        with override_settings(CRISPY_TEMPLATE_PACK=template_pack):
+            for name in names:
+                function = SCENARIOS[name](template_pack)
+                if function is None:
+                    continue
+                result = {"scenario": name, "template_pack": template_pack}
+                result.update(measure(function, rounds=rounds, min_time=min_time, timer=SCENARIOS[name].timer))
+                if SCENARIOS[name].budget is not None:
+                    result["budget"] = SCENARIOS[name].budget
+                results.append(result)
+                if report is not None:
+                    report(result)
+
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "crispy_forms": crispy_forms.__version__,
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=10.0):
+    """
+    Compares two results of `run` and returns a `(lines, regressions)` tuple. `lines` is a
+    readable table of the changes of p50 latency and memory peak of every scenario found in
+    both results, `regressions` lists the scenarios where any of them grew more than
+    `threshold` percent, and those whose p50 latency is over their budget, compared to it.
+    """
+    baseline_results = {(result["scenario"], result["template_pack"]): result for result in baseline["results"]}
+
+    lines = ["%-28s %-11s %-12s %13s %13s %9s" % ("scenario", "pack", "metric", "baseline", "current", "change")]
+    regressions = []
+    for result in current["results"]:
+        key = (result["scenario"], result["template_pack"])
+        budget = result.get("budget")
+        if budget is not None:
+            change = (result["p50"] - budget) / budget * 100
+            over_budget = change > 0
+            lines.append(
+                "%-28s %-11s %-12s %9.3f %-3s %9.3f %-3s %+8.1f%%%s"
+                % (
+                    *key,
+                    "budget",
+                    budget * 1000,
+                    "ms",
+                    result["p50"] * 1000,
+                    "ms",
+                    change,
+                    "  OVER BUDGET" if over_budget else "",
+                )
+            )
+            if over_budget:
+                regressions.append((*key, "budget", change))
+        if key not in baseline_results:
+            continue
+        for metric, unit, scale in (("p50", "ms", 1000), ("memory_peak", "KiB", 1 / 1024)):
+            before, after = baseline_results[key][metric], result[metric]
+            change = (after - before) / before * 100 if before else 0.0
+            regressed = change > threshold
+            lines.append(
+                "%-28s %-11s %-12s %9.3f %-3s %9.3f %-3s %+8.1f%%%s"
+                % (
+                    *key,
+                    metric,
+                    before * scale,
+                    unit,
+                    after * scale,
+                    unit,
+                    change,
+                    "  REGRESSION" if regressed else "",
+                )
+            )
+            if regressed:
+                regressions.append((*key, metric, change))
+
+    return lines, regressions
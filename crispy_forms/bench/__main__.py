@@ -0,0 +1,116 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+
+import django
+
+from crispy_forms.bench import SCENARIOS, compare, run
+
+
+def add_run_arguments(parser):
+    parser.add_argument("-k", dest="keyword", help="only run scenarios whose name contains KEYWORD")
+    parser.add_argument(
+        "--pack", action="append", help="template pack to use, CRISPY_ALLOWED_TEMPLATE_PACKS setting by default"
+    )
+    parser.add_argument("--rounds", type=int, help="fixed number of rounds per scenario")
+    parser.add_argument("--min-time", type=float, default=1.0, help="minimum seconds spent per scenario")
+    parser.add_argument("--scenarios", required=True, help="module registering the scenarios, like myapp.benchmarks")
+    parser.add_argument(
+        "--settings",
+        default=os.environ.get("DJANGO_SETTINGS_MODULE"),
+        required="DJANGO_SETTINGS_MODULE" not in os.environ,
+        help="Django settings module, DJANGO_SETTINGS_MODULE environment variable by default",
+    )
+
+
+def print_result(result):
+    budget = ""
+    if "budget" in result:
+        budget = " (budget %.3f ms%s)" % (
+            result["budget"] * 1000,
+            ", OVER" if result["p50"] > result["budget"] else "",
+        )
+    print(
+        "%-28s %-11s %10.3f ms %10.3f ms %10.1f KiB%s"
+        % (
+            result["scenario"],
+            result["template_pack"],
+            result["p50"] * 1000,
+            result["p95"] * 1000,
+            result["memory_peak"] / 1024,
+            budget,
+        ),
+        file=sys.stderr,
+    )
+
+
+def run_scenarios(args):
+    os.environ["DJANGO_SETTINGS_MODULE"] = args.settings
+    django.setup()
+
+    from django.conf import settings
+
+    importlib.import_module(args.scenarios)
+    names = [name for name in SCENARIOS if not args.keyword or args.keyword in name]
+    template_packs = args.pack or getattr(settings, "CRISPY_ALLOWED_TEMPLATE_PACKS", [settings.CRISPY_TEMPLATE_PACK])
+    return run(names, template_packs, rounds=args.rounds, min_time=args.min_time, report=print_result)
+
+
+def dump(results, path):
+    with open(path, "w") as output:
+        json.dump(results, output, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m crispy_forms.bench", description="Benchmark django-crispy-forms.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="measure scenarios and write the results as JSON")
+    add_run_arguments(run_parser)
+    run_parser.add_argument("-o", "--output", help="write JSON results to OUTPUT instead of stdout")
+
+    compare_parser = commands.add_parser(
+        "compare", help="measure scenarios and fail if they regressed compared to a baseline"
+    )
+    add_run_arguments(compare_parser)
+    compare_parser.add_argument(
+        "--baseline", default="bench-baseline.json", help="baseline JSON file, saved if missing"
+    )
+    compare_parser.add_argument(
+        "--threshold", type=float, default=10.0, help="allowed regression, in percent, 10 by default"
+    )
+    compare_parser.add_argument("--update", action="store_true", help="save the results as the new baseline")
+
+    args = parser.parse_args(argv)
+    results = run_scenarios(args)
+
+    if args.command == "run":
+        if args.output:
+            dump(results, args.output)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        dump(results, args.baseline)
+        print("No baseline found, results saved to %s." % args.baseline)
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    lines, regressions = compare(baseline, results, threshold=args.threshold)
+    print("\n".join(lines))
+
+    if args.update:
+        dump(results, args.baseline)
+        print("Baseline %s updated." % args.baseline)
+    elif regressions:
+        print("\n%s regression(s) above %s%%." % (len(regressions), args.threshold))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
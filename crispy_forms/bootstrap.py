@@ -1,12 +1,11 @@
+from copy import copy
 from random import randint
 
-from django.template import Template
-from django.template.loader import render_to_string
 from django.utils.safestring import SafeString
 from django.utils.text import slugify
 
 from .layout import Div, Field, LayoutObject, TemplateNameMixin
-from .utils import TEMPLATE_PACK, flatatt, render_field
+from .utils import TEMPLATE_PACK, flatatt, load_template, render_field, render_template_code
 
 
 class PrependedAppendedText(Field):
@@ -305,10 +304,8 @@ class FormActions(LayoutObject):
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
         html = self.get_rendered_fields(form, context, template_pack, **kwargs)
-        template = self.get_template_name(template_pack)
-        context.update({"formactions": self, "fields_output": html})
-
-        return render_to_string(template, context.flatten())
+        with context.push({"formactions": self, "fields_output": html}):
+            return self.render_template(template_pack, context)
 
 
 class InlineCheckboxes(Field):
@@ -458,6 +455,9 @@ class FieldWithButtons(Div):
         super().__init__(*fields, css_id=css_id, css_class=css_class, template=template, **kwargs)
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, extra_context=None, **kwargs):
+        div = copy(self)
+        div.bound_fields = []
+
         # We first render the buttons
         field_template = self.field_template % template_pack
         buttons = SafeString(
@@ -467,7 +467,7 @@ class FieldWithButtons(Div):
                     form,
                     context,
                     field_template,
-                    layout_object=self,
+                    layout_object=div,
                     template_pack=template_pack,
                     **kwargs,
                 )
@@ -475,7 +475,7 @@ class FieldWithButtons(Div):
             )
         )
 
-        extra_context = {"div": self, "buttons": buttons}
+        extra_context = {"div": div, "buttons": buttons}
         template = self.get_template_name(template_pack)
 
         if isinstance(self.fields[0], Field):
@@ -556,11 +556,11 @@ class StrictButton(TemplateNameMixin):
         self.flat_attrs = flatatt(kwargs)
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
-        self.content = Template(str(self.content)).render(context)
-        template = self.get_template_name(template_pack)
-        context.update({"button": self})
-
-        return render_to_string(template, context.flatten())
+        button = copy(self)
+        button.content = render_template_code(self.content, form, context)
+        template = self.get_template(template_pack)
+        with context.push({"button": button}):
+            return template.render(context.flatten())
 
 
 class Container(Div):
@@ -610,7 +610,7 @@ class Container(Div):
         """
         check if field_name is contained within tab.
         """
-        return field_name in (pointer.name for pointer in self.get_field_names())
+        return field_name in self.get_index().field_names
 
 
 class ContainerHolder(Div):
@@ -653,19 +653,37 @@ class ContainerHolder(Div):
                 return tab
         return None
 
+    def get_target_group_for_form(self, form):
+        """
+        Returns the group that should be open, without modifying any group.
+        This is either the first group with errors or the first group
+        in the container, unless that first group was originally set to
+        active=False, in which case None is returned.
+        """
+        if getattr(form, "crispy_skeleton", None) is not None:
+            # The open group depends on the form's errors
+            form.crispy_skeleton.cacheable = False
+
+        target = self.first_container_with_errors(form.errors.keys())
+        if target is None:
+            target = self.fields[0]
+            if getattr(target, "_active_originally_included", None):
+                return None
+
+        return target
+
     def open_target_group_for_form(self, form):
         """
         Makes sure that the first group that should be open is open.
         This is either the first group with errors or the first group
         in the container, unless that first group was originally set to
         active=False.
+
+        Rendering doesn't use this method, as it changes the groups in place.
         """
-        target = self.first_container_with_errors(form.errors.keys())
+        target = self.get_target_group_for_form(form)
         if target is None:
-            target = self.fields[0]
-            if not getattr(target, "_active_originally_included", None):
-                target.active = True
-            return target
+            return self.fields[0]
 
         target.active = True
         return target
@@ -714,21 +732,27 @@ class Tab(Container):
     css_class = "tab-pane"
     link_template = "%s/layout/tab-link.html"
 
+    def get_render_tab(self):
+        """
+        Returns a copy of the tab whose css_class includes "active" only if the tab is active.
+        """
+        tab = copy(self)
+        if self.active:
+            if "active" not in self.css_class:
+                tab.css_class += " active"
+        else:
+            tab.css_class = self.css_class.replace("active", "")
+        return tab
+
     def render_link(self, template_pack=TEMPLATE_PACK, **kwargs):
         """
-        Render the link for the tab-pane. It must be called after render so css_class is updated
-        with active if needed.
+        Render the link for the tab-pane.
         """
         link_template = self.link_template % template_pack
-        return render_to_string(link_template, {"link": self})
+        return load_template(link_template).render({"link": self.get_render_tab()})
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
-        if self.active:
-            if "active" not in self.css_class:
-                self.css_class += " active"
-        else:
-            self.css_class = self.css_class.replace("active", "")
-        return super().render(form, context, template_pack)
+        return super(Tab, self.get_render_tab()).render(form, context, template_pack)
 
 
 class TabHolder(ContainerHolder):
@@ -773,17 +797,21 @@ class TabHolder(ContainerHolder):
     template = "%s/layout/tab.html"
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+        # Only the tab that should be open is active, tabs are copied to leave them untouched
+        target = self.get_target_group_for_form(form)
+        tabs = []
         for tab in self.fields:
-            tab.active = False
+            active = tab is target
+            tab = copy(tab)
+            tab.active = active
+            tabs.append(tab)
 
-        # Open the group that should be open.
-        self.open_target_group_for_form(form)
-        content = self.get_rendered_fields(form, context, template_pack)
-        links = SafeString("".join(tab.render_link(template_pack) for tab in self.fields))
+        content = SafeString("".join(render_field(tab, form, context, template_pack=template_pack) for tab in tabs))
+        links = SafeString("".join(tab.render_link(template_pack) for tab in tabs))
 
-        context.update({"tabs": self, "links": links, "content": content})
-        template = self.get_template_name(template_pack)
-        return render_to_string(template, context.flatten())
+        template = self.get_template(template_pack)
+        with context.push({"tabs": self, "links": links, "content": content}):
+            return template.render(context.flatten())
 
 
 class AccordionGroup(Container):
@@ -888,17 +916,19 @@ class Accordion(ContainerHolder):
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
         content = SafeString("")
 
-        # Open the group that should be open.
-        self.open_target_group_for_form(form)
+        # Open the group that should be open, groups are copied to leave them untouched
+        target = self.get_target_group_for_form(form)
 
         for group in self.fields:
+            active = group is target or getattr(group, "active", False)
+            group = copy(group)
+            group.active = active
             group.data_parent = self.css_id
             content += render_field(group, form, context, template_pack=template_pack, **kwargs)
 
-        template = self.get_template_name(template_pack)
-        context.update({"accordion": self, "content": content})
-
-        return render_to_string(template, context.flatten())
+        template = self.get_template(template_pack)
+        with context.push({"accordion": self, "content": content}):
+            return template.render(context.flatten())
 
 
 class Alert(Div):
@@ -957,10 +987,9 @@ class Alert(Div):
         self.dismiss = dismiss
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
-        template = self.get_template_name(template_pack)
-        context.update({"alert": self, "content": self.content, "dismiss": self.dismiss})
-
-        return render_to_string(template, context.flatten())
+        template = self.get_template(template_pack)
+        with context.push({"alert": self, "content": self.content, "dismiss": self.dismiss}):
+            return template.render(context.flatten())
 
 
 class UneditableField(Field):
@@ -1126,6 +1155,6 @@ class Modal(LayoutObject):
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
         fields = self.get_rendered_fields(form, context, template_pack, **kwargs)
-        template = self.get_template_name(template_pack)
+        template = self.get_template(template_pack)
 
-        return render_to_string(template, {"modal": self, "fields": fields})
+        return template.render({"modal": self, "fields": fields})
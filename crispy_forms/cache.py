@@ -0,0 +1,229 @@
+import hashlib
+import itertools
+import re
+from functools import partial
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.utils.functional import Promise
+from django.utils.safestring import SafeString
+from django.utils.translation import get_language
+
+from crispy_forms.exceptions import DescriptionError
+from crispy_forms.utils import render_field, render_template_string
+
+CSRF_PLACEHOLDER = "crispy-forms-csrf-token-placeholder"
+
+
+def get_render_cache():
+    """
+    Returns the cache where rendered forms are stored, named by `CRISPY_CACHE_ALIAS`
+    setting ("default" by default).
+    """
+    from django.core.cache import caches
+
+    return caches[getattr(settings, "CRISPY_CACHE_ALIAS", "default")]
+
+
+# Versions of layout objects and helpers are stamps taken from a global counter, so a newer
+# version is always greater
+versions = itertools.count(1)
+
+
+def read_version(obj):
+    """
+    Returns the version of `obj`, a layout object or helper, stamping it on first read.
+    Objects whose version was never read aren't stamped when they change, so building
+    layouts and helpers doesn't take stamps.
+    """
+    version = obj.__dict__.get("_version")
+    if version is None:
+        version = obj.__dict__["_version"] = next(versions)
+    return version
+
+
+# Memory address in a repr, like "<object object at 0x7f...>", which differs in every process
+MEMORY_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+# Bookkeeping attributes of layout objects and helpers, left out of their description
+UNDESCRIBED_ATTRIBUTES = frozenset(("_fingerprint", "_index", "_memo", "_parents", "_version"))
+
+
+def describe(value, _seen=None):
+    """
+    Returns a description of `value` made of builtin types, whose `repr` is the same for
+    equal layout objects, helpers or attributes, in every process.
+
+    Functions and classes are described by their module and qualified name. Raises
+    `DescriptionError` for values that can't be described that way, like lambdas, functions
+    defined within functions or objects whose `repr` is their memory address.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Promise):
+        return str(value)
+    if isinstance(value, BuiltinFunctionType) and not isinstance(value.__self__, (ModuleType, type(None))):
+        # Method of a builtin object
+        return [describe(value.__self__, _seen), value.__qualname__]
+    if isinstance(value, type):
+        return "%s.%s" % (value.__module__, value.__qualname__)
+    if isinstance(value, (FunctionType, BuiltinFunctionType)):
+        if "<" in value.__qualname__:
+            # Lambdas, and functions defined within functions whose closures may differ,
+            # share their qualified name
+            raise DescriptionError("%r has no stable description" % value)
+        return "%s.%s" % (value.__module__, value.__qualname__)
+
+    _seen = _seen or set()
+    if id(value) in _seen:
+        # Reference cycle
+        return "<%s>" % describe(type(value))
+    _seen = _seen | {id(value)}
+
+    if isinstance(value, MethodType):
+        return [describe(value.__self__, _seen), describe(value.__func__, _seen)]
+    if isinstance(value, partial):
+        return [describe(type(value)), describe([value.func, value.args, value.keywords], _seen)]
+    if isinstance(value, (list, tuple)):
+        return [describe(item, _seen) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(repr(describe(item, _seen)) for item in value)
+    if isinstance(value, dict):
+        return sorted((str(key), describe(item, _seen)) for key, item in value.items())
+    if hasattr(value, "__dict__"):
+        attributes = {name: item for name, item in vars(value).items() if name not in UNDESCRIBED_ATTRIBUTES}
+        return [describe(type(value)), describe(attributes, _seen)]
+    description = repr(value)
+    if MEMORY_ADDRESS.search(description):
+        raise DescriptionError("%s has no stable description" % description)
+    return description
+
+
+def describe_fields(form):
+    """
+    Returns a description of the fields of `form`, which its `__init__` may have added,
+    removed or changed, like per user choices, so that forms with different fields don't
+    share a cached rendering.
+    """
+    description = []
+    for name, field in form.fields.items():
+        if hasattr(field, "queryset"):
+            # Model choices are described by their query, they aren't fetched here
+            try:
+                choices = str(field.queryset.query)
+            except EmptyResultSet:
+                choices = None
+        else:
+            choices = list(getattr(field, "choices", ()))
+        widget = field.widget
+        description.append(
+            [
+                name,
+                type(field),
+                type(widget),
+                widget.attrs,
+                choices,
+                field.label,
+                field.help_text,
+                field.required,
+                field.disabled,
+                field.initial,
+            ]
+        )
+    return describe(description)
+
+
+def get_cache_key(form, helper, template_pack, is_formset, csrf, skeleton=False):
+    """
+    Returns the key of the cached rendering of `form`, an unbound form or formset, rendered
+    with `helper` and `template_pack` in the active language. `csrf` tells whether the
+    rendering holds a CSRF token placeholder.
+
+    If `skeleton` is set, it's the key of the layout's skeleton, which doesn't depend on the
+    form's data but on the names of its fields, see `Skeleton`.
+    """
+    if skeleton:
+        # The fields rendered out of the layout are picked from the form's fields
+        form_description = [
+            "skeleton",
+            sorted((name, field.widget.is_hidden, field.widget.is_required) for name, field in form.fields.items()),
+        ]
+    elif is_formset:
+        # Forms of model formsets get their initial data from the queryset's objects
+        form_description = [
+            form.total_form_count(),
+            form.initial,
+            [
+                (subform.initial, getattr(getattr(subform, "instance", None), "pk", None), describe_fields(subform))
+                for subform in form.forms
+            ],
+        ]
+    else:
+        form_description = [
+            form.initial,
+            getattr(getattr(form, "instance", None), "pk", None),
+            describe_fields(form),
+        ]
+    description = [
+        helper.fingerprint(),
+        describe(type(form)),
+        form.prefix,
+        form.auto_id,
+        describe(form_description),
+        str(template_pack),
+        get_language(),
+        csrf,
+    ]
+    return "crispy_forms.render.%s" % hashlib.sha1(repr(description).encode()).hexdigest()
+
+
+class Skeleton:
+    """
+    Per-request parts of a layout rendered in skeleton mode.
+
+    While a form has a `crispy_skeleton` attribute, `render_field` doesn't render its fields
+    but returns a placeholder, recording the arguments needed to render them later. So does
+    `render_template_code` for template code, like the content of `HTML` objects, `Fieldset`
+    legends or button values, which may depend on the request. Their output is a skeleton
+    of the layout, which doesn't depend on the form's data and can be cached. `fill` renders the placeholders
+    for a given form and context.
+
+    Layout objects whose output depends on the form's data, like a `MultiField` showing
+    errors or a `TabHolder` opening the tab with errors, set `cacheable` to False.
+    """
+
+    def __init__(self):
+        self.marker = "crispy-hole-%s" % uuid4().hex
+        self.holes = []
+        self.cacheable = True
+
+    def add_hole(self, hole):
+        self.holes.append(hole)
+        return SafeString("%s-%s-" % (self.marker, len(self.holes) - 1))
+
+    def add_field(self, field, **kwargs):
+        """
+        Returns a placeholder for `field`, to be rendered by `render_field` with `kwargs`.
+        """
+        return self.add_hole((field, kwargs))
+
+    def add_html(self, html):
+        """
+        Returns a placeholder for the template code `html`, to be rendered with the context.
+        """
+        return self.add_hole((None, html))
+
+    def fill(self, html, form, context):
+        """
+        Returns `html`, a skeleton, with its placeholders rendered for `form` and `context`.
+        """
+
+        def render_hole(match):
+            field, value = self.holes[int(match.group(1))]
+            if field is None:
+                return render_template_string(value, context)
+            return render_field(field, form, context, **value)
+
+        return SafeString(re.sub(r"%s-(\d+)-" % self.marker, render_hole, html))
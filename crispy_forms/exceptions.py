@@ -14,3 +14,13 @@ class FormHelpersException(CrispyError):
 
 class DynamicError(CrispyError):
     pass
+
+
+class DescriptionError(CrispyError):
+    """
+    This is raised when a value of a layout, helper or form has no description that is
+    the same in every process, like a lambda, so it can't be part of a fingerprint or a
+    render cache key.
+    """
+
+    pass
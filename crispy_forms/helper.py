@@ -1,12 +1,58 @@
+import hashlib
 import re
+from copy import copy
+from functools import lru_cache
+from weakref import WeakKeyDictionary
 
-from django.urls import NoReverseMatch, reverse
+from asgiref.sync import sync_to_async
+from django.urls import NoReverseMatch, get_resolver, get_script_prefix, get_urlconf, reverse
 from django.utils.safestring import mark_safe
 
+from crispy_forms.cache import UNDESCRIBED_ATTRIBUTES, describe, read_version, versions
 from crispy_forms.exceptions import FormHelpersException
-from crispy_forms.layout import Layout
-from crispy_forms.layout_slice import LayoutSlice
-from crispy_forms.utils import TEMPLATE_PACK, flatatt, list_difference, render_field
+from crispy_forms.utils import TEMPLATE_PACK, TemplateCache, flatatt, list_difference, render_field
+
+
+@lru_cache(maxsize=1024)
+def _reverse_form_action(action, resolver, script_prefix):
+    try:
+        return reverse(action, urlconf=resolver.urlconf_name)
+    except NoReverseMatch:
+        return action
+
+
+def reverse_form_action(action):
+    """
+    Returns the URL named `action`, or `action` itself if it isn't the name of a URL.
+    Results are memoized per URL resolver, which Django replaces when URLs change.
+    """
+    return _reverse_form_action(action, get_resolver(get_urlconf()), get_script_prefix())
+
+
+# Layouts resulting from `DynamicLayoutHandler.transform_layout`, by key, the least recently
+# used ones are dropped so that keys built at runtime don't grow it without bound
+transformed_layouts = TemplateCache(maxsize=256)
+
+# Helper attributes `DynamicLayoutHandler.transform_layout` doesn't record, the layout is
+# copied on its own and the form is the one of each helper
+UNTRANSFORMED_ATTRIBUTES = frozenset(("layout", "form", *UNDESCRIBED_ATTRIBUTES))
+
+
+def copy_attributes(attributes):
+    """
+    Returns a copy of the helper `attributes` recorded by `DynamicLayoutHandler.transform_layout`.
+    Inputs are copied, as well as list, dict and set values, like `LayoutObject.clone` does.
+    """
+    from crispy_forms.layout import clone_field
+
+    copied = {}
+    for name, value in attributes.items():
+        if name == "inputs":
+            value = [clone_field(input_object) for input_object in value]
+        elif isinstance(value, (list, dict, set)):
+            value = copy(value)
+        copied[name] = value
+    return copied
 
 
 class DynamicLayoutHandler:
@@ -19,12 +65,19 @@ class DynamicLayoutHandler:
         if self.form is None:
             raise FormHelpersException("You need to pass a form instance to your FormHelper")
 
+    def _layout_slice(self, key):
+        # Layout objects and the dynamic API are imported when used, so that loading template
+        # tags doesn't import them
+        from crispy_forms.layout_slice import LayoutSlice
+
+        return LayoutSlice(self.layout, key)
+
     def all(self):
         """
         Returns all layout objects of first level of depth
         """
         self._check_layout()
-        return LayoutSlice(self.layout, slice(0, len(self.layout.fields), 1))
+        return self._layout_slice(slice(0, len(self.layout.fields), 1))
 
     def filter(self, *LayoutClasses, max_level=0, greedy=False):
         """
@@ -33,7 +86,7 @@ class DynamicLayoutHandler:
         self._check_layout()
         filtered_layout_objects = self.layout.get_layout_objects(LayoutClasses, max_level=max_level, greedy=greedy)
 
-        return LayoutSlice(self.layout, filtered_layout_objects)
+        return self._layout_slice(filtered_layout_objects)
 
     def filter_by_widget(self, widget_type):
         """
@@ -48,7 +101,7 @@ class DynamicLayoutHandler:
             if isinstance(self.form.fields[pointer.name].widget, widget_type):
                 filtered_fields.append(pointer)
 
-        return LayoutSlice(self.layout, filtered_fields)
+        return self._layout_slice(filtered_fields)
 
     def exclude_by_widget(self, widget_type):
         """
@@ -63,7 +116,52 @@ class DynamicLayoutHandler:
             if not isinstance(self.form.fields[pointer.name].widget, widget_type):
                 filtered_fields.append(pointer)
 
-        return LayoutSlice(self.layout, filtered_fields)
+        return self._layout_slice(filtered_fields)
+
+    def transform_layout(self, key, function):
+        """
+        Calls `function` with the helper to modify its layout through the dynamic API, and
+        keeps a copy of the resulting layout under `key`. Later calls with the same `key`
+        set the helper's layout to a copy of it instead of calling `function` again::
+
+            self.helper = FormHelper(self)
+            self.helper.transform_layout(type(self), self.customize_layout)
+
+        Other helper attributes `function` sets or modifies, like `form_id`, `attrs` or
+        `inputs` through `add_input`, are recorded too and set again on later calls. So
+        the result of `function` must only depend on what `key` identifies, like the form
+        class, not on the form instance or its data. The layouts of the 256 most recently
+        used keys are kept.
+        """
+        transformed = []
+
+        def transform():
+            state = self.__dict__.copy()
+            attrs, inputs = self.attrs.copy(), list(self.inputs)
+            function(self)
+            self._check_layout()
+            transformed.append(self.layout)
+
+            changes = {
+                name: value
+                for name, value in self.__dict__.items()
+                if name not in UNTRANSFORMED_ATTRIBUTES and (name not in state or state[name] is not value)
+            }
+            # attrs and inputs may be modified in place
+            if self.attrs != attrs:
+                changes["attrs"] = self.attrs
+            if self.inputs != inputs:
+                changes["inputs"] = self.inputs
+            removed = [name for name in state if name not in self.__dict__]
+            return self.layout.clone(), copy_attributes(changes), removed
+
+        layout, changes, removed = transformed_layouts.get(key, transform)
+        if not transformed:
+            self.layout = layout.clone()
+            for name, value in copy_attributes(changes).items():
+                setattr(self, name, value)
+            for name in removed:
+                self.__dict__.pop(name, None)
 
     def __getitem__(self, key):
         """
@@ -77,24 +175,22 @@ class DynamicLayoutHandler:
             if hasattr(self, key):
                 return getattr(self, key)
 
-            self._check_layout()
-            layout_field_names = self.layout.get_field_names()
+            from crispy_forms.layout import Pointer
 
-            filtered_field = []
-            for pointer in layout_field_names:
-                # There can be an empty pointer
-                if pointer.name == key:
-                    filtered_field.append(pointer)
-
-            return LayoutSlice(self.layout, filtered_field)
+            self._check_layout()
+            pointers = [
+                Pointer(list(positions), key, parent, key)
+                for positions, parent in self.layout.get_index().field_names.get(key, [])
+            ]
+            return self._layout_slice(pointers)
 
-        return LayoutSlice(self.layout, key)
+        return self._layout_slice(key)
 
     def __setitem__(self, key, value):
         self.layout[key] = value
 
     def __delitem__(self, key):
-        del self.layout.fields[key]
+        del self.layout[key]
 
     def __len__(self):
         if self.layout is not None:
@@ -146,6 +242,12 @@ class FormHelper(DynamicLayoutHandler):
         **include_media**: Whether to automatically include form media. Set to False if
             you want to manually include form media outside the form. Defaults to True.
 
+        **render_cache**: Number of seconds unbound forms rendered with this helper are kept
+            in Django's cache, see `crispy_forms.cache`. Defaults to None, not cached.
+
+        **render_cache_skeleton**: If set, `render_cache` keeps the skeleton of the layout, whose
+            fields are rendered for every request, so bound forms can use it. Defaults to False.
+
     Public Methods:
 
         **add_input(input)**: You can add input buttons using this method. Inputs
@@ -177,6 +279,9 @@ class FormHelper(DynamicLayoutHandler):
 
         {% load crispy_forms_tags %}
         {% crispy form %}
+
+    A helper that doesn't depend on the form instance can be built once per form class
+    with `class_helper`, see its documentation.
     """
 
     _form_method = "post"
@@ -204,6 +309,8 @@ class FormHelper(DynamicLayoutHandler):
     label_class = ""
     field_class = ""
     include_media = True
+    render_cache = None
+    render_cache_skeleton = False
 
     def __init__(self, form=None):
         self.attrs = {}
@@ -214,6 +321,8 @@ class FormHelper(DynamicLayoutHandler):
             self.layout = self.build_default_layout(form)
 
     def build_default_layout(self, form):
+        from crispy_forms.layout import Layout
+
         return Layout(*form.fields.keys())
 
     @property
@@ -232,10 +341,7 @@ class FormHelper(DynamicLayoutHandler):
 
     @property
     def form_action(self):
-        try:
-            return reverse(self._form_action)
-        except NoReverseMatch:
-            return self._form_action
+        return reverse_form_action(self._form_action)
 
     @form_action.setter
     def form_action(self, action):
@@ -259,43 +365,162 @@ class FormHelper(DynamicLayoutHandler):
         self._error_text_inline = flag
         self._help_text_inline = not flag
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if "_version" in self.__dict__:
+            # Otherwise its version was never read, like while it's built
+            self.bump_version()
+
+    @property
+    def version(self):
+        """
+        Number that grows every time the helper or its layout is modified, see
+        `LayoutObject.version`. Modifying `inputs` list directly doesn't change it, use
+        `add_input` or call `bump_version`.
+        """
+        if self.layout is not None:
+            return max(read_version(self), self.layout.version)
+        return read_version(self)
+
+    def bump_version(self):
+        """
+        Gives the helper a new version, if its version was ever read.
+        """
+        if "_version" in self.__dict__:
+            self.__dict__["_version"] = next(versions)
+
+    def fingerprint(self):
+        """
+        Returns a hash of the helper's attributes and its layout, see `LayoutObject.fingerprint`.
+        The form the helper was built from isn't part of it. It's computed once per `version`
+        and content of `attrs` and `inputs`.
+        """
+        state = (self.version, self.attrs, self.inputs)
+        fingerprint = self.__dict__.get("_fingerprint")
+        if fingerprint is not None and fingerprint[0] == state:
+            return fingerprint[1]
+
+        attributes = {
+            name: value for name, value in vars(self).items() if name != "form" and name not in UNDESCRIBED_ATTRIBUTES
+        }
+        result = hashlib.sha1(repr([describe(type(self)), describe(attributes)]).encode()).hexdigest()
+        # Copies, so that in place modifications of attrs or inputs are noticed
+        self.__dict__["_fingerprint"] = ((state[0], self.attrs.copy(), list(self.inputs)), result)
+        return result
+
+    def memoize(self, key, function):
+        """
+        Returns the result of `function`, computed once for `key` until the helper is
+        modified, by attribute assignment, `add_input` or a change of `attrs` or `inputs`.
+        """
+        memo = self.__dict__.get("_memo")
+        version = read_version(self)
+        if memo is None or memo[0] != (version, self.attrs, self.inputs):
+            # Copies, so that in place modifications of attrs or inputs are noticed
+            memo = self.__dict__["_memo"] = ((version, self.attrs.copy(), list(self.inputs)), {})
+        results = memo[1]
+        if key not in results:
+            results[key] = function()
+        return results[key]
+
     def add_input(self, input_object):
         self.inputs.append(input_object)
+        self.bump_version()
 
     def add_layout(self, layout):
         self.layout = layout
 
-    def render_layout(self, form, context, template_pack=TEMPLATE_PACK):
+    def with_overrides(self, **attributes):
+        """
+        Returns a copy of the helper with `attributes` set, sharing its layout, so that a
+        helper built once can be customized per form instance::
+
+            self.helper = type(self).helper.with_overrides(form_action=reverse("edit", args=[pk]))
+
+        The layout isn't copied, modifying it modifies the layout of the original helper.
+        """
+        helper = copy(self)
+        helper.attrs = self.attrs.copy()
+        helper.inputs = list(self.inputs)
+        for name, value in attributes.items():
+            setattr(helper, name, value)
+        return helper
+
+    def render_layout(self, form, context, template_pack=TEMPLATE_PACK, render_hidden_fields=False):
         """
         Returns safe html of the rendering of the layout
+
+        If `render_hidden_fields` is set, hidden fields not in the layout are rendered, as if
+        the helper's `render_hidden_fields` attribute was set. It's used for formsets' forms.
         """
         form.rendered_fields = set()
         form.crispy_field_template = self.field_template
+        render_hidden_fields = render_hidden_fields or self.render_hidden_fields
 
-        # This renders the specified Layout strictly
-        html = self.layout.render(form, context, template_pack=template_pack)
+        # This renders the specified Layout strictly, through its render plan
+        html = self.layout.get_render_plan(template_pack).render(form, context)
 
         # Rendering some extra fields if specified
-        if self.render_unmentioned_fields or self.render_hidden_fields or self.render_required_fields:
+        html += "".join(self._iter_extra_fields(form, context, template_pack, render_hidden_fields))
+
+        return mark_safe(html)
+
+    async def arender_layout(self, form, context, template_pack=TEMPLATE_PACK, render_hidden_fields=False):
+        """
+        Asynchronous version of `render_layout`, the layout is rendered with its `arender` method.
+        """
+        form.rendered_fields = set()
+        form.crispy_field_template = self.field_template
+        render_hidden_fields = render_hidden_fields or self.render_hidden_fields
+
+        html = await self.layout.arender(form, context, template_pack=template_pack)
+        html += await sync_to_async(
+            lambda: "".join(self._iter_extra_fields(form, context, template_pack, render_hidden_fields))
+        )()
+
+        return mark_safe(html)
+
+    def iter_render_layout(self, form, context, template_pack=TEMPLATE_PACK, render_hidden_fields=False):
+        """
+        Same as `render_layout`, but yields the safe html of every top-level layout object, and
+        then of every extra field, as soon as it's rendered.
+        """
+        form.rendered_fields = set()
+        form.crispy_field_template = self.field_template
+        render_hidden_fields = render_hidden_fields or self.render_hidden_fields
+
+        yield from self.layout.get_render_plan(template_pack).iter_render(form, context)
+        yield from self._iter_extra_fields(form, context, template_pack, render_hidden_fields)
+
+    def _iter_extra_fields(self, form, context, template_pack, render_hidden_fields):
+        """
+        Yields the html of the fields not in the layout that have to be rendered anyway.
+        """
+        if self.render_unmentioned_fields or render_hidden_fields or self.render_required_fields:
             fields = tuple(form.fields.keys())
             left_fields_to_render = list_difference(fields, form.rendered_fields)
             for field in left_fields_to_render:
                 if (
                     self.render_unmentioned_fields
-                    or (self.render_hidden_fields and form.fields[field].widget.is_hidden)
+                    or (render_hidden_fields and form.fields[field].widget.is_hidden)
                     or (self.render_required_fields and form.fields[field].widget.is_required)
                 ):
-                    html += render_field(field, form, context, template_pack=template_pack)
-
-        return mark_safe(html)
+                    yield render_field(field, form, context, template_pack=template_pack)
 
     def get_attributes(self, template_pack=TEMPLATE_PACK):
         """
-        Used by crispy_forms_tags to get helper attributes
+        Used by crispy_forms_tags to get helper attributes. The result is memoized, see
+        `memoize`, and must not be modified.
         """
+        form_action = self.form_action
+        return self.memoize(
+            ("attributes", template_pack, form_action), lambda: self.build_attributes(template_pack, form_action)
+        )
+
+    def build_attributes(self, template_pack, form_action):
         attrs = self.attrs.copy() if self.attrs else {}
-        if self.form_action:
-            attrs["action"] = self.form_action.strip()
+        if form_action:
+            attrs["action"] = form_action.strip()
         if self.form_id:
             attrs["id"] = self.form_id.strip()
         if self.form_class:
@@ -348,3 +573,40 @@ class FormHelper(DynamicLayoutHandler):
                 items[attribute_name] = value
 
         return items
+
+
+class class_helper:
+    """
+    Decorator turning a function that builds a helper from a form class into a form
+    attribute, built once per form class and shared by its instances::
+
+        class MyForm(forms.Form):
+            title = forms.CharField(_("Title"))
+
+            @class_helper
+            def helper(form_class):
+                helper = FormHelper()
+                helper.form_id = 'this-form-rocks'
+                helper.layout = Layout('title', Submit('save', 'save'))
+                return helper
+
+    Instances needing a few different attributes can set their own helper, sharing the
+    layout, with `FormHelper.with_overrides`::
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.helper = type(self).helper.with_overrides(form_id='another-id')
+
+    The helper is shared, it must not be modified once built.
+    """
+
+    def __init__(self, function):
+        self.function = function
+        self.helpers = WeakKeyDictionary()
+        self.__doc__ = function.__doc__
+
+    def __get__(self, instance, owner):
+        helper = self.helpers.get(owner)
+        if helper is None:
+            helper = self.helpers[owner] = self.function(owner)
+        return helper
@@ -0,0 +1,121 @@
+"""
+Jinja2 support: a `crispy()` global and the crispy filters, to render forms from Jinja2
+templates, and the field helpers of `crispy_forms_field` tags, like `crispy_field()` or
+`is_checkbox` filter, for template packs written as Jinja2 templates. Use `environment`
+as the environment of Django's Jinja2 engine::
+
+    TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.jinja2.Jinja2",
+            "APP_DIRS": True,
+            "OPTIONS": {"environment": "crispy_forms.jinja2.environment"},
+        },
+        ...
+    ]
+
+Or add `crispy_globals` and `crispy_filters` to your own environment. Layouts are rendered
+with the templates of `CRISPY_TEMPLATE_ENGINE`, see `crispy_forms.utils.get_template_engine`.
+"""
+
+from functools import wraps
+
+from django.utils.safestring import mark_safe
+from jinja2 import Environment, pass_context
+
+from crispy_forms.templatetags.crispy_forms_field import (
+    classes,
+    crispy_addon,
+    css_class,
+    is_checkbox,
+    is_checkboxselectmultiple,
+    is_clearable_file,
+    is_file,
+    is_multivalue,
+    is_password,
+    is_radioselect,
+    is_select,
+    render_crispy_field,
+)
+from crispy_forms.templatetags.crispy_forms_filters import (
+    as_crispy_errors,
+    as_crispy_field,
+    as_crispy_form,
+    flatatt_filter,
+    optgroups,
+)
+from crispy_forms.utils import render_crispy_form
+
+
+def safe(function):
+    """
+    Marks the output of `function` safe, as Jinja2 templates return plain strings.
+    """
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        return mark_safe(function(*args, **kwargs))
+
+    return wrapper
+
+
+@pass_context
+def crispy(context, form, helper=None):
+    """
+    Renders `form` with `helper`, or the form's `helper` attribute, like `{% crispy %}` tag
+    does. The template's context is available to the layout::
+
+        {{ crispy(form) }}
+        {{ crispy(form, helper) }}
+    """
+    return mark_safe(render_crispy_form(form, helper, context.get_all()))
+
+
+def crispy_field(field, attrs=None, **kwargs):
+    """
+    Renders the bound `field` with attributes added to its widgets, like `{% crispy_field %}`
+    tag does. Attributes are given as a dictionary, a list of them for a `MultiWidget`, or as
+    keyword arguments::
+
+        {{ crispy_field(field, {"class": "form-control", "aria-describedby": field.auto_id}) }}
+        {{ crispy_field(field, placeholder=field.label) }}
+    """
+    if attrs is None:
+        attrs = kwargs
+    elif kwargs:
+        attrs = {**attrs, **kwargs}
+    return mark_safe(render_crispy_field(field, attrs))
+
+
+crispy_globals = {
+    "crispy": crispy,
+    "crispy_field": crispy_field,
+    "crispy_addon": safe(crispy_addon),
+}
+
+crispy_filters = {
+    "crispy": safe(as_crispy_form),
+    "as_crispy_errors": safe(as_crispy_errors),
+    "as_crispy_field": safe(as_crispy_field),
+    "flatatt": flatatt_filter,
+    "optgroups": optgroups,
+    "is_checkbox": is_checkbox,
+    "is_password": is_password,
+    "is_radioselect": is_radioselect,
+    "is_select": is_select,
+    "is_checkboxselectmultiple": is_checkboxselectmultiple,
+    "is_file": is_file,
+    "is_clearable_file": is_clearable_file,
+    "is_multivalue": is_multivalue,
+    "classes": classes,
+    "css_class": css_class,
+}
+
+
+def environment(**options):
+    """
+    Returns a Jinja2 environment with crispy globals and filters.
+    """
+    env = Environment(**options)
+    env.globals.update(crispy_globals)
+    env.filters.update(crispy_filters)
+    return env
@@ -1,18 +1,41 @@
+import asyncio
+import dataclasses
+import hashlib
+import heapq
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import copy, deepcopy
 from dataclasses import dataclass
+from functools import partial
+from weakref import WeakSet
 
-from django.template import Template
-from django.template.loader import render_to_string
+from asgiref.sync import sync_to_async
+from django.template import Context
 from django.utils.html import conditional_escape
 from django.utils.safestring import SafeString
 from django.utils.text import slugify
 
-from crispy_forms.utils import TEMPLATE_PACK, flatatt, render_field
+from crispy_forms.cache import describe, read_version, versions
+from crispy_forms.native import get_native_renderer
+from crispy_forms.utils import (
+    TEMPLATE_PACK,
+    arender_field,
+    flatatt,
+    load_template,
+    loaded_templates,
+    render_field,
+    render_template_code,
+)
 
 
 @dataclass
 class Pointer:
     positions: list[int]
     name: str
+    # Layout object holding the pointed one, and the pointed layout object or field name, so
+    # the pointer is resolved by identity and stays valid when the layout is restructured
+    parent: "LayoutObject" = dataclasses.field(default=None, compare=False, repr=False)
+    layout_object: "LayoutObject | str" = dataclasses.field(default=None, compare=False, repr=False)
 
 
 class TemplateNameMixin:
@@ -24,16 +47,206 @@ class TemplateNameMixin:
 
         return template
 
+    def get_template(self, template_pack):
+        """
+        Returns the template object for `template_pack`, loaded once and cached by name.
+        """
+        return load_template(self.get_template_name(template_pack))
+
+    def render_template(self, template_pack, context):
+        """
+        Renders the template for `template_pack` with `context`, a dictionary or a context
+        holding the template's variables, using its native renderer if it has one, see
+        `crispy_forms.native`.
+        """
+        return self.get_template_renderer(template_pack)(context)
+
+    def get_template_renderer(self, template_pack):
+        """
+        Returns a function rendering the template for `template_pack` with a context, like
+        `render_template`, with the template or its native renderer looked up once.
+        """
+        template_name = self.get_template_name(template_pack)
+        renderer = get_native_renderer(template_name)
+        if renderer is not None:
+            return renderer
+        template = load_template(template_name)
+
+        def render(context):
+            if isinstance(context, Context):
+                context = context.flatten()
+            return template.render(context)
+
+        return render
+
+
+class LayoutIndex:
+    """
+    Positions of the layout objects and field names within a layout object, gathered in one
+    traversal of its tree. It stays current while the `fields` of the layout objects in the
+    tree hold the same layout objects and field names, however they are modified.
+    """
+
+    def __init__(self, layout_object):
+        # (layout object, copy of its fields) for the layout objects with fields in the tree
+        self.containers = [(layout_object, layout_object.fields[:])]
+        # Class -> list of (positions, layout object, parent), in layout order
+        self.layout_objects = {}
+        # Field name -> list of (positions, parent), in layout order
+        self.field_names = {}
+        # Template pack -> RenderPlan of the layout object, see `LayoutObject.get_render_plan`
+        self.plans = {}
+        parents = {(): layout_object}
+        for positions, child in layout_object.iter_layout_objects():
+            parent = parents[positions[:-1]]
+            if hasattr(child, "get_field_names"):
+                parents[positions] = child
+                self.containers.append((child, child.fields[:]))
+            self.layout_objects.setdefault(type(child), []).append((positions, child, parent))
+            if isinstance(child, str):
+                self.field_names.setdefault(child, []).append((positions, parent))
+
+    def is_current(self):
+        """
+        Returns whether the tree still matches the index, comparing the `fields` of its layout
+        objects with their copies, so that modifying `fields` lists in place is noticed too.
+        """
+        return all(layout_object.fields == fields for layout_object, fields in self.containers)
+
+    def find(self, LayoutClasses, max_depth=None):
+        """
+        Returns the (positions, layout object, parent) tuples of layout objects of any type matching
+        `LayoutClasses`, at most `max_depth` levels deep if given, in layout order.
+        """
+        matches = [entries for cls, entries in self.layout_objects.items() if issubclass(cls, LayoutClasses)]
+        if len(matches) == 1:
+            entries = matches[0]
+        else:
+            entries = heapq.merge(*matches, key=lambda entry: entry[0])
+        if max_depth is None:
+            return list(entries)
+        return [entry for entry in entries if len(entry[0]) <= max_depth]
+
+
+def overrides(layout_object, cls, *names):
+    """
+    Returns whether the class of `layout_object` overrides any of the `names` methods of `cls`.
+    """
+    layout_class = type(layout_object)
+    return any(getattr(layout_class, name) is not getattr(cls, name) for name in names)
+
+
+def get_render_step(field, template_pack):
+    """
+    Returns a function rendering `field`, an item of a layout object's `fields`, with
+    `(form, context)`, like `render_field` does.
+    """
+    if isinstance(field, LayoutObject):
+        return field.get_render_step(template_pack)
+    return partial(render_field, field, template_pack=template_pack)
+
+
+def render_steps(steps, form, context):
+    return SafeString("".join(step(form, context) for step in steps))
+
+
+class RenderPlan:
+    """
+    Render plan of a layout object for a template pack, see `LayoutObject.get_render_plan`.
+    `steps` holds a function rendering each item of its `fields` with `(form, context)`.
+
+    Built-in layout objects whose rendering isn't overridden, `Div`, `Row`, `Column`,
+    `Fieldset` and `ButtonHolder`, are rendered by steps holding their template, or native
+    renderer, and the steps of their fields, so rendering doesn't resolve template names,
+    native renderers and templates again. Other layout objects are rendered with `render`.
+    """
+
+    def __init__(self, layout_object, template_pack, key=None):
+        self.layout_object = layout_object
+        self.template_pack = template_pack
+        self.key = key
+        self.steps = [get_render_step(field, template_pack) for field in layout_object.fields]
+
+    def render(self, form, context):
+        """
+        Renders the layout object, like its `render` method does.
+        """
+        if overrides(self.layout_object, Layout, "render", "get_rendered_fields"):
+            return self.layout_object.render(form, context, template_pack=self.template_pack)
+        return render_steps(self.steps, form, context)
+
+    def iter_render(self, form, context):
+        """
+        Yields the html of every item of the layout object's `fields`, as soon as it's rendered.
+        """
+        for step in self.steps:
+            yield step(form, context)
+
+
+# Layout objects modified during the current `LayoutObject.batch()`, None outside batches
+batched_layout_objects = ContextVar("batched_layout_objects", default=None)
+
+
+def iter_holders(layout_objects):
+    """
+    Yields `layout_objects` and the layout objects holding them at any depth, once each.
+    """
+    pending = list(layout_objects)
+    seen = set()
+    while pending:
+        layout_object = pending.pop()
+        if id(layout_object) not in seen:
+            seen.add(id(layout_object))
+            yield layout_object
+            pending.extend(layout_object.__dict__.get("_parents", ()))
+
+
+def stamp_versions(layout_objects):
+    """
+    Gives `layout_objects` and the layout objects holding them one new version. Those whose
+    version was never read are left unstamped, they take a new version when it's read.
+    """
+    version = None
+    for layout_object in iter_holders(layout_objects):
+        if "_version" in layout_object.__dict__:
+            if version is None:
+                version = next(versions)
+            layout_object.__dict__["_version"] = version
+
+
+def clone_field(field):
+    """
+    Returns a copy of `field`, an item of a layout object's `fields`, see `LayoutObject.clone`.
+    """
+    if isinstance(field, LayoutObject):
+        return field.clone()
+    if isinstance(field, str):
+        return field
+    return deepcopy(field)
+
+
+# Methods a layout object's render step stands for, see `LayoutObject.get_render_step`
+RENDER_METHODS = ("render", "get_rendered_fields", "render_template", "get_template_renderer", "get_template_name")
+
+# `fields` list methods that modify it
+LIST_MUTATORS = frozenset(("append", "clear", "extend", "insert", "pop", "remove", "reverse", "sort"))
+
 
 class LayoutObject(TemplateNameMixin):
     def __getitem__(self, slice):
         return self.fields[slice]
 
     def __setitem__(self, slice, value):
+        previous_fields = list(self.fields)
         self.fields[slice] = value
+        self._adopt(self.fields, previous_fields)
+        self.bump_version()
 
     def __delitem__(self, slice):
+        previous_fields = list(self.fields)
         del self.fields[slice]
+        self._adopt(self.fields, previous_fields)
+        self.bump_version()
 
     def __len__(self):
         return len(self.fields)
@@ -45,10 +258,189 @@ class LayoutObject(TemplateNameMixin):
         """
         # Check necessary for unpickling, see #107
         if "fields" in self.__dict__ and hasattr(self.fields, name):
+            if name in LIST_MUTATORS:
+                return self._mutator(getattr(self.fields, name))
             return getattr(self.fields, name)
         else:
             return object.__getattribute__(self, name)
 
+    def __setattr__(self, name, value):
+        state = self.__dict__
+        if name == "fields":
+            previous_fields = state.get("fields", ())
+            object.__setattr__(self, name, value)
+            self._adopt(value, previous_fields)
+        else:
+            object.__setattr__(self, name, value)
+        if "_version" in state or state.get("_parents"):
+            # Otherwise nothing read its version or holds it, like while it's built
+            self.bump_version()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_parents", None)
+        state.pop("_index", None)
+        # Stamps come from the counter of the process, unpickled objects take a new one
+        state.pop("_version", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "fields" in state:
+            self._adopt(self.fields)
+
+    def __copy__(self):
+        # Shallow copies hold per-render state. They share `fields` without registering as
+        # parent of the layout objects within, so rendering doesn't modify shared layouts
+        layout_object = object.__new__(type(self))
+        layout_object.__dict__.update(self.__getstate__())
+        return layout_object
+
+    @property
+    def version(self):
+        """
+        Number that grows every time the layout object, or any layout object within it, is
+        modified through the dynamic API, `[]` operator, list methods like `append`, or
+        attribute assignment. Modifying `fields` list directly doesn't change it, call
+        `bump_version` then.
+        """
+        return read_version(self)
+
+    def bump_version(self):
+        """
+        Gives the layout object, and the layout objects holding it, a new version. Within a
+        `batch`, that's deferred to the end of the batch.
+        """
+        if "_version" not in self.__dict__ and not self.__dict__.get("_parents"):
+            # Nothing read its version or holds it, like while it's built
+            return
+
+        modified = batched_layout_objects.get()
+        if modified is not None:
+            modified.append(self)
+            return
+
+        stamp_versions([self])
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager deferring version changes until it exits, when all the layout
+        objects modified within it, and the layout objects holding them, get one new
+        version. Caches keyed on versions are invalidated once instead of after every
+        operation::
+
+            with helper.layout.batch():
+                helper.filter(str, greedy=True).wrap(Field, css_class="field")
+                helper[0:2].wrap_together(Div, css_class="names")
+        """
+        if batched_layout_objects.get() is not None:
+            # Nested batch, the outermost one bumps versions
+            yield self
+            return
+
+        modified = []
+        token = batched_layout_objects.set(modified)
+        try:
+            yield self
+        finally:
+            batched_layout_objects.reset(token)
+            if modified:
+                stamp_versions(modified)
+
+    def is_within(self, layout_object):
+        """
+        Returns whether the layout object is held by `layout_object`, at any depth, following
+        the links to the layout objects holding it.
+        """
+        return any(holder is layout_object for holder in iter_holders(self.__dict__.get("_parents", ())))
+
+    def _adopt(self, fields, previous_fields=()):
+        """
+        Registers `self` as parent of the layout objects in `fields`, so their modifications
+        change its version, and unregisters it from the layout objects of `previous_fields`
+        it doesn't hold anymore.
+        """
+        # Layout objects it held, those it still holds already have it as parent
+        previous = {id(field): field for field in previous_fields if isinstance(field, LayoutObject)}
+        for field in fields:
+            if isinstance(field, LayoutObject) and previous.pop(id(field), None) is None:
+                if "_parents" not in field.__dict__:
+                    field.__dict__["_parents"] = WeakSet()
+                field._parents.add(self)
+        for field in previous.values():
+            field.__dict__.get("_parents", set()).discard(self)
+
+    def _mutator(self, method):
+        def mutate(*args, **kwargs):
+            previous_fields = list(self.fields)
+            result = method(*args, **kwargs)
+            self._adopt(self.fields, previous_fields)
+            self.bump_version()
+            return result
+
+        return mutate
+
+    def clone(self):
+        """
+        Returns a copy of the layout object and the layout objects within it. Their list,
+        dict and set attributes are copied too, so modifying the copy doesn't affect the
+        original, while other attribute values are shared.
+        """
+        clone = object.__new__(type(self))
+        for name, value in self.__dict__.items():
+            if name in ("_parents", "_index"):
+                continue
+            if name == "fields":
+                value = [clone_field(field) for field in value]
+            elif isinstance(value, (list, dict, set)):
+                value = copy(value)
+            clone.__dict__[name] = value
+        if "fields" in clone.__dict__:
+            clone._adopt(clone.fields)
+        return clone
+
+    def fingerprint(self):
+        """
+        Returns a hash of the layout tree: the classes, field names, attributes and templates
+        of the layout object and every layout object within it. Equal layouts have the same
+        fingerprint, whatever the process.
+        """
+        return hashlib.sha1(repr(describe(self)).encode()).hexdigest()
+
+    def iter_layout_objects(self, *LayoutClasses, max_level=None):
+        """
+        Yields `(positions, layout_object)` tuples for the layout objects within this one
+        matching `LayoutClasses`, or all of them if none is given, depth first and in layout
+        order. `positions` is a tuple of indexes, like `(0, 1, 2)`.
+
+        :param max_level: An integer that indicates max level depth to reach when
+        traversing the layout. The whole layout is traversed if it's None.
+        """
+        stack = [((), iter(enumerate(self.fields)))]
+        while stack:
+            index, children = stack[-1]
+            for i, layout_object in children:
+                positions = index + (i,)
+                if not LayoutClasses or isinstance(layout_object, LayoutClasses):
+                    yield positions, layout_object
+                if hasattr(layout_object, "get_field_names") and (max_level is None or len(index) < max_level):
+                    # Walk its fields, then resume with the following siblings
+                    stack.append((positions, iter(enumerate(layout_object.fields))))
+                    break
+            else:
+                stack.pop()
+
+    def get_index(self):
+        """
+        Returns the `LayoutIndex` of the layout object, built on first use and rebuilt once
+        the layout objects or field names within it changed.
+        """
+        index = self.__dict__.get("_index")
+        if index is None or not index.is_current():
+            index = self.__dict__["_index"] = LayoutIndex(self)
+        return index
+
     def get_field_names(self, index=None):
         """
         Returns a list of Pointers. First parameter is the location of the
@@ -76,34 +468,69 @@ class LayoutObject(TemplateNameMixin):
         :param greedy: Boolean that indicates whether to be greedy. If set, max_level
         is skipped.
         """
-        pointers = []
-
         if index is not None and not isinstance(index, list):
             index = [index]
         elif index is None:
             index = []
 
         str_class = len(LayoutClasses) == 1 and LayoutClasses[0] == str
-        for i, layout_object in enumerate(self.fields):
-            if isinstance(layout_object, LayoutClasses):
-                if str_class:
-                    pointers.append(Pointer(index + [i], layout_object))
-                else:
-                    pointers.append(Pointer(index + [i], layout_object.__class__.__name__.lower()))
-
-            # If it's a layout object and we haven't reached the max depth limit or greedy
-            # we recursive call
-            if hasattr(layout_object, "get_field_names") and (len(index) < max_level or greedy):
-                new_kwargs = {"index": index + [i], "max_level": max_level, "greedy": greedy}
-                pointers = pointers + layout_object.get_layout_objects(*LayoutClasses, **new_kwargs)
-
-        return pointers
+        entries = self.get_index().find(LayoutClasses, max_depth=None if greedy else max_level + 1)
+        return [
+            Pointer(
+                index + list(positions),
+                layout_object if str_class else layout_object.__class__.__name__.lower(),
+                parent,
+                layout_object,
+            )
+            for positions, layout_object, parent in entries
+        ]
+
+    def get_render_plan(self, template_pack=TEMPLATE_PACK):
+        """
+        Returns the `RenderPlan` of the layout object for `template_pack`. It's built once
+        and built again when the layout is modified, including its `fields` lists in place,
+        or when loaded templates are cleared, as when `TEMPLATES` setting changes.
+        """
+        key = (self.version, loaded_templates.generation)
+        plans = self.get_index().plans
+        plan = plans.get(template_pack)
+        if plan is None or plan.key != key:
+            plan = plans[template_pack] = RenderPlan(self, template_pack, key)
+        return plan
+
+    def get_render_step(self, template_pack=TEMPLATE_PACK):
+        """
+        Returns a function rendering the layout object with `(form, context)`, see
+        `RenderPlan`. It calls `render`, built-in layout objects that can resolve their
+        templates ahead of rendering override it.
+        """
+        return partial(self.render, template_pack=template_pack)
 
     def get_rendered_fields(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
         return SafeString(
             "".join(render_field(field, form, context, template_pack=template_pack, **kwargs) for field in self.fields)
         )
 
+    async def arender(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+        """
+        Asynchronous version of `render`. By default it calls `render` in a thread, through
+        `sync_to_async`, layout objects that need to await something while rendering override it.
+        """
+        return await sync_to_async(self.render)(form, context, template_pack=template_pack, **kwargs)
+
+    async def aget_rendered_fields(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+        """
+        Asynchronous version of `get_rendered_fields`. Fields are rendered concurrently, each
+        one with its own copy of `context`.
+        """
+        rendered_fields = await asyncio.gather(
+            *(
+                arender_field(field, form, context.__copy__(), template_pack=template_pack, **kwargs)
+                for field in self.fields
+            )
+        )
+        return SafeString("".join(rendered_fields))
+
 
 class Layout(LayoutObject):
     """
@@ -140,6 +567,11 @@ class Layout(LayoutObject):
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
         return self.get_rendered_fields(form, context, template_pack, **kwargs)
 
+    async def arender(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+        if type(self).render is not Layout.render:
+            return await super().arender(form, context, template_pack=template_pack, **kwargs)
+        return await self.aget_rendered_fields(form, context, template_pack, **kwargs)
+
 
 class ButtonHolder(LayoutObject):
     """
@@ -190,10 +622,21 @@ class ButtonHolder(LayoutObject):
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
         html = self.get_rendered_fields(form, context, template_pack, **kwargs)
 
-        template = self.get_template_name(template_pack)
-        context.update({"buttonholder": self, "fields_output": html})
+        with context.push({"buttonholder": self, "fields_output": html}):
+            return self.render_template(template_pack, context)
+
+    def get_render_step(self, template_pack=TEMPLATE_PACK):
+        if overrides(self, ButtonHolder, *RENDER_METHODS):
+            return super().get_render_step(template_pack)
+        steps = [get_render_step(field, template_pack) for field in self.fields]
+        render_template = self.get_template_renderer(template_pack)
+
+        def render(form, context):
+            html = render_steps(steps, form, context)
+            with context.push({"buttonholder": self, "fields_output": html}):
+                return render_template(context)
 
-        return render_to_string(template, context.flatten())
+        return render
 
 
 class BaseInput(TemplateNameMixin):
@@ -252,11 +695,11 @@ class BaseInput(TemplateNameMixin):
         Renders an `<input />` if container is used as a Layout object.
         Input button value can be a variable in context.
         """
-        self.value = Template(str(self.value)).render(context)
-        template = self.get_template_name(template_pack)
-        context.update({"input": self})
-
-        return render_to_string(template, context.flatten())
+        button = copy(self)
+        button.value = render_template_code(self.value, form, context)
+        template = self.get_template(template_pack)
+        with context.push({"input": button}):
+            return template.render(context.flatten())
 
 
 class Submit(BaseInput):
@@ -576,15 +1019,39 @@ class Fieldset(LayoutObject):
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
         fields = self.get_rendered_fields(form, context, template_pack, **kwargs)
+        return self.render_with_fields(fields, context, template_pack, form=form)
+
+    async def arender(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+        if type(self).render is not Fieldset.render:
+            return await super().arender(form, context, template_pack=template_pack, **kwargs)
+        fields = await self.aget_rendered_fields(form, context, template_pack, **kwargs)
+        return self.render_with_fields(fields, context, template_pack, form=form)
+
+    def render_with_fields(self, fields, context, template_pack=TEMPLATE_PACK, form=None):
+        """
+        Renders the fieldset around `fields`, the already rendered html of its fields.
+        """
+        return self._render_with_fields(fields, form, context, partial(self.render_template, template_pack))
 
+    def _render_with_fields(self, fields, form, context, render_template):
         if self.legend:
-            legend = Template(str(self.legend)).render(context)
+            legend = render_template_code(self.legend, form, context)
         else:
             legend = SafeString("")
 
-        template = self.get_template_name(template_pack)
-        context.update({"fieldset": self, "legend": legend, "fields": fields})
-        return render_to_string(template, context.flatten())
+        with context.push({"fieldset": self, "legend": legend, "fields": fields}):
+            return render_template(context)
+
+    def get_render_step(self, template_pack=TEMPLATE_PACK):
+        if overrides(self, Fieldset, "render_with_fields", *RENDER_METHODS):
+            return super().get_render_step(template_pack)
+        steps = [get_render_step(field, template_pack) for field in self.fields]
+        render_template = self.get_template_renderer(template_pack)
+
+        def render(form, context):
+            return self._render_with_fields(render_steps(steps, form, context), form, context, render_template)
+
+        return render
 
 
 class MultiField(LayoutObject):
@@ -653,11 +1120,14 @@ class MultiField(LayoutObject):
         self.flat_attrs = flatatt(kwargs)
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+        # Render state lives in a copy, so that the same instance can be rendered many times
+        multifield = copy(self)
+        multifield.bound_fields = []
+
         # If a field within MultiField contains errors
         if context["form_show_errors"]:
-            for field in (pointer.name for pointer in self.get_field_names()):
-                if field in form.errors:
-                    self.css_class += " error"
+            if any(field_name in form.errors for field_name in self.get_index().field_names):
+                multifield.css_class += " error"
 
         field_template = self.field_template % template_pack
         fields_output = self.get_rendered_fields(
@@ -666,14 +1136,13 @@ class MultiField(LayoutObject):
             template_pack,
             template=field_template,
             labelclass=self.label_class,
-            layout_object=self,
+            layout_object=multifield,
             **kwargs,
         )
 
-        template = self.get_template_name(template_pack)
-        context.update({"multifield": self, "fields_output": fields_output})
-
-        return render_to_string(template, context.flatten())
+        template = self.get_template(template_pack)
+        with context.push({"multifield": multifield, "fields_output": fields_output}):
+            return template.render(context.flatten())
 
 
 class Div(LayoutObject):
@@ -745,9 +1214,30 @@ class Div(LayoutObject):
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
         fields = self.get_rendered_fields(form, context, template_pack, **kwargs)
+        return self.render_with_fields(fields, context, template_pack)
 
-        template = self.get_template_name(template_pack)
-        return render_to_string(template, {"div": self, "fields": fields})
+    async def arender(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+        if type(self).render is not Div.render:
+            return await super().arender(form, context, template_pack=template_pack, **kwargs)
+        fields = await self.aget_rendered_fields(form, context, template_pack, **kwargs)
+        return self.render_with_fields(fields, context, template_pack)
+
+    def render_with_fields(self, fields, context, template_pack=TEMPLATE_PACK):
+        """
+        Renders the div around `fields`, the already rendered html of its fields.
+        """
+        return self.render_template(template_pack, {"div": self, "fields": fields})
+
+    def get_render_step(self, template_pack=TEMPLATE_PACK):
+        if overrides(self, Div, "render_with_fields", *RENDER_METHODS):
+            return super().get_render_step(template_pack)
+        steps = [get_render_step(field, template_pack) for field in self.fields]
+        render_template = self.get_template_renderer(template_pack)
+
+        def render(form, context):
+            return render_template({"div": self, "fields": render_steps(steps, form, context)})
+
+        return render
 
 
 class Row(Div):
@@ -871,7 +1361,7 @@ class HTML:
         self.html = html
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
-        return Template(str(self.html)).render(context)
+        return render_template_code(self.html, form, context)
 
 
 class Field(LayoutObject):
@@ -936,8 +1426,7 @@ class Field(LayoutObject):
         self.attrs.update({k.replace("_", "-"): conditional_escape(v) for k, v in kwargs.items()})
 
     def render(self, form, context, template_pack=TEMPLATE_PACK, extra_context=None, **kwargs):
-        if extra_context is None:
-            extra_context = {}
+        extra_context = extra_context.copy() if extra_context is not None else {}
         if self.wrapper_class:
             extra_context["wrapper_class"] = self.wrapper_class
 
@@ -1,6 +1,6 @@
 from crispy_forms.bootstrap import Container
 from crispy_forms.exceptions import DynamicError
-from crispy_forms.layout import Fieldset, MultiField
+from crispy_forms.layout import Fieldset, MultiField, iter_holders
 
 
 class LayoutSlice:
@@ -37,6 +37,41 @@ class LayoutSlice:
             else:
                 return LayoutClass(fields, **kwargs)
 
+    def resolve(self, pointer):
+        """
+        Returns the layout object holding the layout object `pointer` points to, and its
+        position in it. Pointers built by the dynamic API are resolved through their `parent`,
+        where the pointed layout object is looked up by identity, so they stay valid when the
+        layout around it is restructured. Pointers built by hand are resolved from their
+        positions. Raises `DynamicError` if the pointed layout object isn't in the layout anymore.
+        """
+        if pointer.parent is None or pointer.layout_object is None:
+            layout_object = self.layout
+            try:
+                for i in pointer.positions[:-1]:
+                    layout_object = layout_object.fields[i]
+                layout_object.fields[pointer.positions[-1]]
+            except (AttributeError, IndexError):
+                raise DynamicError("Pointer %s doesn't point to a layout object of the layout" % (pointer,))
+            return layout_object, pointer.positions[-1]
+
+        parent = pointer.parent
+        if parent is not self.layout and not parent.is_within(self.layout):
+            raise DynamicError("The layout object %s points to was removed from the layout" % (pointer,))
+
+        def points_to(field):
+            if isinstance(pointer.layout_object, str):
+                return field == pointer.layout_object
+            return field is pointer.layout_object
+
+        position = pointer.positions[-1]
+        if position >= len(parent.fields) or not points_to(parent.fields[position]):
+            # Layout objects were added or removed before it
+            position = next((i for i, field in enumerate(parent.fields) if points_to(field)), None)
+            if position is None:
+                raise DynamicError("The layout object %s points to was removed from the layout" % (pointer,))
+        return parent, position
+
     def pre_map(self, function):
         """
         Iterates over layout objects pointed in `self.slice` executing `function` on them.
@@ -48,26 +83,22 @@ class LayoutSlice:
 
         elif isinstance(self.slice, list):
             # A list of pointers  Ex: [[[0, 0], 'div'], [[0, 2, 3], 'field_name']]
+            # Layout objects replaced so far, pointers within them point to what they were
+            replaced = set()
             for pointer in self.slice:
-                positions = pointer.positions
-
-                # If it's pointing first level
-                if len(positions) == 1:
-                    function(self.layout, positions[-1])
-                else:
-                    layout_object = self.layout.fields[positions[0]]
-                    for i in positions[1:-1]:
-                        layout_object = layout_object.fields[i]
-
-                    try:
-                        function(layout_object, positions[-1])
-                    except IndexError:
-                        # We could avoid this exception, recalculating pointers.
-                        # However this case is most of the time an undesired behavior
-                        raise DynamicError(
-                            "Trying to wrap a field within an already wrapped field, \
-                            recheck your filter or layout"
-                        )
+                layout_object, position = self.resolve(pointer)
+                if replaced and any(id(holder) in replaced for holder in iter_holders([layout_object])):
+                    raise DynamicError(
+                        "Trying to wrap a field within an already wrapped field, \
+                        recheck your filter or layout"
+                    )
+                pointed = layout_object.fields[position]
+                function(layout_object, position)
+                if layout_object.fields[position] is not pointed:
+                    replaced.add(id(pointed))
+                    # The pointer follows the layout object wrapping what it pointed to
+                    pointer.positions[-1] = position
+                    pointer.layout_object = layout_object.fields[position]
 
     def wrap(self, LayoutClass, *args, **kwargs):
         """
@@ -76,7 +107,7 @@ class LayoutSlice:
         """
 
         def wrap_object(layout_object, j):
-            layout_object.fields[j] = self.wrapped_object(LayoutClass, layout_object.fields[j], *args, **kwargs)
+            layout_object[j] = self.wrapped_object(LayoutClass, layout_object.fields[j], *args, **kwargs)
 
         self.pre_map(wrap_object)
 
@@ -89,7 +120,7 @@ class LayoutSlice:
 
         def wrap_object_once(layout_object, j):
             if not isinstance(layout_object, LayoutClass):
-                layout_object.fields[j] = self.wrapped_object(LayoutClass, layout_object.fields[j], *args, **kwargs)
+                layout_object[j] = self.wrapped_object(LayoutClass, layout_object.fields[j], *args, **kwargs)
 
         self.pre_map(wrap_object_once)
 
@@ -101,14 +132,12 @@ class LayoutSlice:
         if isinstance(self.slice, slice):
             # The start of the slice is replaced
             start = self.slice.start if self.slice.start is not None else 0
-            self.layout.fields[start] = self.wrapped_object(
-                LayoutClass, self.layout.fields[self.slice], *args, **kwargs
-            )
+            self.layout[start] = self.wrapped_object(LayoutClass, self.layout.fields[self.slice], *args, **kwargs)
 
             # The rest of places of the slice are removed, as they are included in the previous
             for i in reversed(range(*self.slice.indices(len(self.layout.fields)))):
                 if i != start:
-                    del self.layout.fields[i]
+                    del self.layout[i]
 
         elif isinstance(self.slice, list):
             raise DynamicError("wrap_together doesn't work with filter, only with [] operator")
@@ -125,12 +154,8 @@ class LayoutSlice:
         elif isinstance(self.slice, list):
             # A list of pointers  Ex: [[[0, 0], 'div'], [[0, 2, 3], 'field_name']]
             for pointer in self.slice:
-                positions = pointer.positions
-
-                layout_object = self.layout.fields[positions[0]]
-                for i in positions[1:]:
-                    previous_layout_object = layout_object
-                    layout_object = layout_object.fields[i]
+                previous_layout_object, position = self.resolve(pointer)
+                layout_object = previous_layout_object.fields[position]
 
                 # If update_attrs is applied to a string, we call to its wrapping layout object
                 if function.__name__ == "update_attrs" and isinstance(layout_object, str):
@@ -152,5 +177,7 @@ class LayoutSlice:
                     else:
                         layout_object.attrs["class"] = kwargs.pop("css_class")
                 layout_object.attrs.update(kwargs)
+                if hasattr(layout_object, "bump_version"):
+                    layout_object.bump_version()
 
         self.map(update_attrs)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from crispy_forms.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Loads and compiles the templates of template packs and renders forms, checking that they work."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pack",
+            action="append",
+            dest="template_packs",
+            help="template pack to warm up, CRISPY_ALLOWED_TEMPLATE_PACKS setting by default",
+        )
+        parser.add_argument(
+            "--form",
+            action="append",
+            dest="forms",
+            help="dotted path to a form class to render, CRISPY_WARMUP_FORMS setting by default",
+        )
+
+    def handle(self, *args, template_packs=None, forms=None, verbosity=1, **options):
+        warmed_up, failures = warm_up(template_packs, forms)
+        if verbosity > 1:
+            for name in warmed_up:
+                self.stdout.write(name)
+        self.stdout.write("Warmed up %s templates and forms." % len(warmed_up))
+        if failures:
+            for name, e in failures:
+                self.stderr.write("%s: %s" % (name, e))
+            raise CommandError("%s templates or forms failed to warm up." % len(failures))
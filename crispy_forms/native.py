@@ -0,0 +1,178 @@
+"""
+Native renderers: Python functions building the HTML of template pack templates which
+only wrap already rendered fields in an element, like `div.html` or `fieldset.html`, so
+that rendering them doesn't go through the template engine.
+
+A native renderer takes the variables the template would be rendered with and returns
+the same HTML, byte for byte, which tests check against the templates of the installed
+template packs. Renderers are registered by template name, a layout object
+whose `template` is overridden is rendered with its template. They are only used when
+`CRISPY_NATIVE_RENDERING` setting is True, as they don't follow the template pack's
+templates overridden in your project. Template packs can register their own with
+`register_native_renderer`.
+"""
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates
+from django.utils.html import conditional_escape
+from django.utils.safestring import SafeString
+
+from crispy_forms.utils import get_template_engine
+
+native_renderers = {}
+
+
+def register_native_renderer(*template_names):
+    """
+    Registers the decorated function as the native renderer of `template_names`.
+    """
+
+    def register(function):
+        for template_name in template_names:
+            native_renderers[template_name] = function
+        return function
+
+    return register
+
+
+def get_native_renderer(template_name):
+    """
+    Returns the native renderer of `template_name`, or None if there is none or native
+    rendering is disabled.
+    """
+    if not getattr(settings, "CRISPY_NATIVE_RENDERING", False) or template_name not in native_renderers:
+        return None
+    engine = get_template_engine()
+    if engine is not None and not isinstance(engine, DjangoTemplates):
+        # Template packs of other engines have their own templates
+        return None
+    return native_renderers[template_name]
+
+
+def attribute(name, value):
+    """
+    Returns `name="value"` if `value` is set, like `{% if value %}name="{{ value }}"{% endif %}`.
+    """
+    return '%s="%s"' % (name, conditional_escape(value)) if value else ""
+
+
+@register_native_renderer("bootstrap3/layout/div.html", "bootstrap4/layout/div.html")
+def render_div(context):
+    div = context["div"]
+    return SafeString(
+        "<div %s \n    %s %s>\n        %s\n</div>\n"
+        % (
+            attribute("id", div.css_id),
+            attribute("class", div.css_class),
+            conditional_escape(div.flat_attrs),
+            conditional_escape(context["fields"]),
+        )
+    )
+
+
+def row_renderer(css_class):
+    def render_row(context):
+        div = context["div"]
+        return SafeString(
+            '<div %s class="%s %s" %s>\n        %s\n</div>\n'
+            % (
+                attribute("id", div.css_id),
+                css_class,
+                conditional_escape(div.css_class or ""),
+                conditional_escape(div.flat_attrs),
+                conditional_escape(context["fields"]),
+            )
+        )
+
+    return render_row
+
+
+register_native_renderer("bootstrap3/layout/row.html")(row_renderer("row"))
+register_native_renderer("bootstrap3/layout/column.html")(row_renderer("formColumn"))
+register_native_renderer("bootstrap4/layout/row.html")(row_renderer("form-row"))
+
+
+@register_native_renderer("bootstrap4/layout/column.html")
+def render_bootstrap4_column(context):
+    div = context["div"]
+    css_class = conditional_escape(div.css_class or "")
+    if "col" not in (div.css_class or ""):
+        css_class = "col-md %s" % css_class
+    return SafeString(
+        '<div %s\n     class="%s" %s>\n        %s\n</div>\n\n\n'
+        % (
+            attribute("id", div.css_id),
+            css_class,
+            conditional_escape(div.flat_attrs),
+            conditional_escape(context["fields"]),
+        )
+    )
+
+
+@register_native_renderer("bootstrap3/layout/buttonholder.html", "bootstrap4/layout/buttonholder.html")
+def render_buttonholder(context):
+    buttonholder = context["buttonholder"]
+    return SafeString(
+        '<div %s \n    class="buttonHolder%s">\n       %s\n</div>\n'
+        % (
+            attribute("id", buttonholder.css_id),
+            " %s" % conditional_escape(buttonholder.css_class) if buttonholder.css_class else "",
+            conditional_escape(context["fields_output"]),
+        )
+    )
+
+
+@register_native_renderer("bootstrap3/layout/fieldset.html", "bootstrap4/layout/fieldset.html")
+def render_fieldset(context):
+    fieldset = context["fieldset"]
+    legend = context["legend"]
+    return SafeString(
+        "<fieldset %s \n    %s\n    %s>\n    %s\n    %s \n</fieldset>\n"
+        % (
+            attribute("id", fieldset.css_id),
+            attribute("class", fieldset.css_class),
+            conditional_escape(fieldset.flat_attrs),
+            "<legend>%s</legend>" % conditional_escape(legend) if legend else "",
+            conditional_escape(context["fields"]),
+        )
+    )
+
+
+@register_native_renderer("bootstrap3/layout/formactions.html")
+def render_bootstrap3_formactions(context):
+    formactions = context["formactions"]
+    label_class = context.get("label_class", "")
+    label_div = (
+        '\n        <div class="aab controls %s"></div>\n    ' % conditional_escape(label_class) if label_class else ""
+    )
+    return SafeString(
+        '<div%s class="form-group %s"%s>\n    %s\n\n    <div class="controls %s">\n        %s\n    </div>\n</div>\n'
+        % (
+            " %s" % conditional_escape(formactions.flat_attrs) if formactions.flat_attrs else "",
+            conditional_escape(formactions.css_class),
+            " %s" % attribute("id", formactions.id) if formactions.id else "",
+            label_div,
+            conditional_escape(context.get("field_class", "")),
+            conditional_escape(context["fields_output"]),
+        )
+    )
+
+
+@register_native_renderer("bootstrap4/layout/formactions.html")
+def render_bootstrap4_formactions(context):
+    formactions = context["formactions"]
+    label_class = context.get("label_class", "")
+    label_div = '\n        <div class="aab %s"></div>\n    ' % conditional_escape(label_class) if label_class else ""
+    form_class = context.get("form_class")
+    return SafeString(
+        '<div%s class="form-group%s %s" %s>\n    %s\n\n    <div class="%s">\n        %s\n    </div>\n</div>\n'
+        % (
+            " %s" % conditional_escape(formactions.flat_attrs) if formactions.flat_attrs else "",
+            " row" if form_class and "form-horizontal" in form_class else "",
+            conditional_escape(formactions.css_class),
+            " %s" % attribute("id", formactions.id) if formactions.id else "",
+            label_div,
+            conditional_escape(context.get("field_class", "")),
+            conditional_escape(context["fields_output"]),
+        )
+    )
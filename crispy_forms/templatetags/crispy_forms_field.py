@@ -1,8 +1,8 @@
 from django import forms, template
 from django.conf import settings
-from django.template import Variable, loader
+from django.template import Variable
 
-from crispy_forms.utils import get_template_pack
+from crispy_forms.utils import get_template_pack, load_template
 
 register = template.Library()
 
@@ -71,6 +71,46 @@ def pairwise(iterable):
     return zip(a, a)
 
 
+def render_crispy_field(field, attrs):
+    """
+    Renders the bound `field` with `attrs` added to the attributes of its widgets, like
+    `{% crispy_field %}` tag does. `attrs` is a dictionary of attributes, or a list of them,
+    one per widget of a `MultiWidget`. Its widgets get their class name as CSS class too.
+    """
+    # There are special django widgets that wrap actual widgets,
+    # such as forms.widgets.MultiWidget, admin.widgets.RelatedFieldWidgetWrapper
+    widgets = getattr(field.field.widget, "widgets", [getattr(field.field.widget, "widget", field.field.widget)])
+
+    if isinstance(attrs, dict):
+        attrs = [attrs] * len(widgets)
+
+    converters = getattr(settings, "CRISPY_CLASS_CONVERTERS", {})
+
+    for widget, attr in zip(widgets, attrs):
+        class_name = widget.__class__.__name__.lower()
+        class_name = converters.get(class_name, class_name)
+        css_class = widget.attrs.get("class", "")
+        if css_class:
+            if css_class.find(class_name) == -1:
+                css_class += " %s" % class_name
+        else:
+            css_class = class_name
+
+        widget.attrs["class"] = css_class
+
+        for attribute_name, attributes in attr.items():
+            if attribute_name in widget.attrs:
+                # multiple attribtes are in a single string, e.g.
+                # "form-control is-invalid"
+                for attr in attributes.split():
+                    if attr not in widget.attrs[attribute_name].split():
+                        widget.attrs[attribute_name] += " " + attr
+            else:
+                widget.attrs[attribute_name] = attributes
+
+    return str(field)
+
+
 class CrispyFieldNode(template.Node):
     def __init__(self, field, attrs):
         self.field = field
@@ -87,42 +127,11 @@ class CrispyFieldNode(template.Node):
 
         field, attrs = context.render_context[self]
         field = field.resolve(context)
-
-        # There are special django widgets that wrap actual widgets,
-        # such as forms.widgets.MultiWidget, admin.widgets.RelatedFieldWidgetWrapper
-        widgets = getattr(field.field.widget, "widgets", [getattr(field.field.widget, "widget", field.field.widget)])
-
-        if isinstance(attrs, dict):
-            attrs = [attrs] * len(widgets)
-
-        converters = getattr(settings, "CRISPY_CLASS_CONVERTERS", {})
-
-        for widget, attr in zip(widgets, attrs):
-            class_name = widget.__class__.__name__.lower()
-            class_name = converters.get(class_name, class_name)
-            css_class = widget.attrs.get("class", "")
-            if css_class:
-                if css_class.find(class_name) == -1:
-                    css_class += " %s" % class_name
-            else:
-                css_class = class_name
-
-            widget.attrs["class"] = css_class
-
-            for attribute_name, attribute in attr.items():
-                attribute_name = Variable(attribute_name).resolve(context)
-                attributes = Variable(attribute).resolve(context)
-
-                if attribute_name in widget.attrs:
-                    # multiple attribtes are in a single string, e.g.
-                    # "form-control is-invalid"
-                    for attr in attributes.split():
-                        if attr not in widget.attrs[attribute_name].split():
-                            widget.attrs[attribute_name] += " " + attr
-                else:
-                    widget.attrs[attribute_name] = attributes
-
-        return str(field)
+        attrs = {
+            Variable(attribute_name).resolve(context): Variable(attribute).resolve(context)
+            for attribute_name, attribute in attrs.items()
+        }
+        return render_crispy_field(field, attrs)
 
 
 @register.tag(name="crispy_field")
@@ -164,5 +173,5 @@ def crispy_addon(field, append="", prepend="", form_show_labels=True):
             "crispy_prepended_text": prepend,
             "crispy_appended_text": append,
         }
-        template = loader.get_template("%s/layout/prepended_appended_text.html" % get_template_pack())
+        template = load_template("%s/layout/prepended_appended_text.html" % get_template_pack())
     return template.render(context)
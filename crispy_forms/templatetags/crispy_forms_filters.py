@@ -1,24 +1,21 @@
-from functools import lru_cache
-
 from django import template
 from django.conf import settings
 from django.forms import boundfield
 from django.forms.formsets import BaseFormSet
-from django.template.loader import get_template
 from django.utils.safestring import mark_safe
 
 from crispy_forms.exceptions import CrispyError
-from crispy_forms.utils import TEMPLATE_PACK, flatatt
+from crispy_forms.utils import TEMPLATE_PACK, flatatt, load_template, pack_template
 
 
-@lru_cache
+@pack_template
 def uni_formset_template(template_pack=TEMPLATE_PACK):
-    return get_template("%s/uni_formset.html" % template_pack)
+    return load_template("%s/uni_formset.html" % template_pack)
 
 
-@lru_cache
+@pack_template
 def uni_form_template(template_pack=TEMPLATE_PACK):
-    return get_template("%s/uni_form.html" % template_pack)
+    return load_template("%s/uni_form.html" % template_pack)
 
 
 register = template.Library()
@@ -74,10 +71,10 @@ def as_crispy_errors(form, template_pack=TEMPLATE_PACK):
         {{ form|as_crispy_errors:"bootstrap4" }}
     """
     if isinstance(form, BaseFormSet):
-        template = get_template("%s/errors_formset.html" % template_pack)
+        template = load_template("%s/errors_formset.html" % template_pack)
         c = {"formset": form}
     else:
-        template = get_template("%s/errors.html" % template_pack)
+        template = load_template("%s/errors.html" % template_pack)
         c = {"form": form}
 
     return template.render(c)
@@ -113,7 +110,7 @@ def as_crispy_field(field, template_pack=TEMPLATE_PACK, label_class="", field_cl
         template_path = helper.field_template
     if not template_path:
         template_path = "%s/field.html" % template_pack
-    template = get_template(template_path)
+    template = load_template(template_path)
 
     return template.render(attributes)
 
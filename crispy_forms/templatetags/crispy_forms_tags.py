@@ -1,12 +1,16 @@
-from functools import lru_cache
+from uuid import uuid4
 
+from asgiref.sync import sync_to_async
 from django import template
 from django.conf import settings
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.forms.formsets import BaseFormSet
-from django.template.loader import get_template
+from django.utils.safestring import SafeString
 
+from crispy_forms.cache import CSRF_PLACEHOLDER, Skeleton, get_cache_key, get_render_cache
+from crispy_forms.exceptions import DescriptionError
 from crispy_forms.helper import FormHelper
-from crispy_forms.utils import TEMPLATE_PACK, get_template_pack
+from crispy_forms.utils import TEMPLATE_PACK, get_template_pack, load_template, pack_template
 
 register = template.Library()
 
@@ -77,73 +81,120 @@ class BasicNode(template.Node):
         `is_formset` is set to True. If the helper has a layout we use it, for rendering the
         form or the formset's forms.
         """
-        # Nodes are not thread safe in multithreaded environments
-        # https://docs.djangoproject.com/en/dev/howto/custom-template-tags/#thread-safety-considerations
-        if self not in context.render_context:
-            context.render_context[self] = (
-                template.Variable(self.form),
-                template.Variable(self.helper) if self.helper else None,
-            )
-        form, helper = context.render_context[self]
+        return self.get_render_state(context)[0]
 
-        actual_form = form.resolve(context)
-        if self.helper is not None:
-            helper = helper.resolve(context)
-        else:
-            # If the user names the helper within the form `helper` (standard), we use it
-            # This allows us to have simplified tag syntax: {% crispy form %}
-            helper = FormHelper() if not hasattr(actual_form, "helper") else actual_form.helper
+    def get_render_state(self, context, render_layout=True):
+        """
+        Same as `get_render`, but returns a `(context, helper, template_pack)` tuple, with the
+        helper and template pack used for this render.
 
-        # use template_pack from helper, if defined
-        try:
-            if helper.template_pack:
-                self.template_pack = helper.template_pack
-        except AttributeError:
-            pass
+        If `render_layout` is False, the helper's layout isn't rendered into `form_html`, which
+        is left to the caller.
 
-        self.actual_helper = helper
+        Nodes are shared between threads, so nothing specific to one render is stored in `self`.
+        """
+        actual_form, helper, template_pack = self.resolve(context)
 
         # We get the response dictionary
         is_formset = isinstance(actual_form, BaseFormSet)
-        response_dict = self.get_response_dict(helper, context, is_formset)
+        response_dict = self.get_response_dict(helper, context, is_formset, template_pack=template_pack)
         node_context = context.__copy__()
         node_context.update({"is_bound": actual_form.is_bound})
         node_context.update(response_dict)
         final_context = node_context.__copy__()
 
         # If we have a helper's layout we use it, for the form or the formset's forms
-        if helper and helper.layout:
+        if render_layout and helper and helper.layout:
             if not is_formset:
-                actual_form.form_html = helper.render_layout(
-                    actual_form, node_context, template_pack=self.template_pack
-                )
+                actual_form.form_html = helper.render_layout(actual_form, node_context, template_pack=template_pack)
             else:
-                forloop = ForLoopSimulator(actual_form)
-                helper.render_hidden_fields = True
-                for form in actual_form:
-                    node_context.update({"forloop": forloop})
-                    node_context.update({"formset_form": form})
-                    form.form_html = helper.render_layout(form, node_context, template_pack=self.template_pack)
-                    forloop.iterate()
+                self.render_formset_layouts(helper, actual_form, node_context, template_pack)
 
         if is_formset:
             final_context["formset"] = actual_form
         else:
             final_context["form"] = actual_form
 
-        return final_context
+        return final_context, helper, template_pack
+
+    def resolve(self, context):
+        """
+        Returns a `(form, helper, template_pack)` tuple, the form or formset and the helper
+        resolved from `context`, and the template pack to use.
+        """
+        # Nodes are not thread safe in multithreaded environments
+        # https://docs.djangoproject.com/en/dev/howto/custom-template-tags/#thread-safety-considerations
+        if self not in context.render_context:
+            context.render_context[self] = (
+                template.Variable(self.form),
+                template.Variable(self.helper) if self.helper else None,
+            )
+        form, helper = context.render_context[self]
+
+        actual_form = form.resolve(context)
+        if self.helper is not None:
+            helper = helper.resolve(context)
+        else:
+            # If the user names the helper within the form `helper` (standard), we use it
+            # This allows us to have simplified tag syntax: {% crispy form %}
+            helper = FormHelper() if not hasattr(actual_form, "helper") else actual_form.helper
+
+        # use template_pack from helper, if defined
+        template_pack = getattr(helper, "template_pack", None) or self.template_pack
+        return actual_form, helper, template_pack
+
+    def render_formset_layouts(self, helper, formset, context, template_pack):
+        """
+        Renders the helper's layout for every form in `formset`, setting each form's `form_html`.
+        `forloop` and `formset_form` variables are available to every form's layout, see
+        `iter_formset_forms`.
+        """
+        for form in self.iter_formset_forms(formset, context):
+            form.form_html = helper.render_layout(
+                form, context, template_pack=template_pack, render_hidden_fields=True
+            )
 
-    def get_response_dict(self, helper, context, is_formset):
+    def iter_formset_forms(self, formset, context):
+        """
+        Yields the forms of `formset`, with `forloop` and `formset_form` set in `context` for
+        the current form until the next one is requested.
+
+        Both variables live in a single dict pushed to the context, so its depth doesn't change
+        with the number of forms.
+        """
+        forloop = ForLoopSimulator(formset)
+        with context.push(forloop=forloop) as formset_context:
+            for form in formset:
+                formset_context["formset_form"] = form
+                yield form
+                forloop.iterate()
+
+    def get_response_dict(self, helper, context, is_formset, template_pack=None):
         """
         Returns a dictionary with all the parameters necessary to render the form/formset in a template.
 
         :param context: `django.template.Context` for the node
         :param is_formset: Boolean value. If set to True, indicates we are working with a formset.
+        :param template_pack: Template pack used for rendering, defaults to the node's template pack.
         """
         if not isinstance(helper, FormHelper):
             raise TypeError("helper object provided to {% crispy %} tag must be a crispy.helper.FormHelper object.")
 
-        attrs = helper.get_attributes(template_pack=self.template_pack)
+        template_pack = template_pack or self.template_pack
+        attrs = helper.get_attributes(template_pack=template_pack)
+        # Attributes only depend on the template pack and the form action, for a given helper
+        key = ("response_dict", template_pack, is_formset, attrs["attrs"].get("action"))
+        response_dict = helper.memoize(key, lambda: self.build_response_dict(attrs, is_formset, template_pack)).copy()
+
+        if "csrf_token" in context:
+            response_dict["csrf_token"] = context["csrf_token"]
+
+        return response_dict
+
+    def build_response_dict(self, attrs, is_formset, template_pack):
+        """
+        Returns the parameters of `get_response_dict` taken from the helper's attributes `attrs`.
+        """
         form_type = "form"
         if is_formset:
             form_type = "formset"
@@ -170,7 +221,7 @@ class BasicNode(template.Node):
             "inputs": attrs.get("inputs", []),
             "is_formset": is_formset,
             "label_class": attrs.get("label_class", ""),
-            "template_pack": self.template_pack,
+            "template_pack": template_pack,
         }
 
         # Handles custom attributes added to helpers
@@ -178,34 +229,182 @@ class BasicNode(template.Node):
             if attribute_name not in response_dict:
                 response_dict[attribute_name] = value
 
-        if "csrf_token" in context:
-            response_dict["csrf_token"] = context["csrf_token"]
-
         return response_dict
 
 
-@lru_cache
+@pack_template
 def whole_uni_formset_template(template_pack=TEMPLATE_PACK):
-    return get_template("%s/whole_uni_formset.html" % template_pack)
+    return load_template("%s/whole_uni_formset.html" % template_pack)
 
 
-@lru_cache
+@pack_template
 def whole_uni_form_template(template_pack=TEMPLATE_PACK):
-    return get_template("%s/whole_uni_form.html" % template_pack)
+    return load_template("%s/whole_uni_form.html" % template_pack)
 
 
 class CrispyFormNode(BasicNode):
-    def render(self, context):
-        c = self.get_render(context).flatten()
+    def __init__(self, form, helper, template_pack=None, cache_timeout=None):
+        super().__init__(form, helper, template_pack=template_pack)
+        self.cache_timeout = cache_timeout
 
-        if self.actual_helper is not None and getattr(self.actual_helper, "template", False):
-            template = get_template(self.actual_helper.template)
+    def render(self, context):
+        actual_form, helper, template_pack = self.resolve(context)
+        if self.cache_timeout is not None:
+            timeout = self.cache_timeout.resolve(context)
         else:
-            if c["is_formset"]:
-                template = whole_uni_formset_template(self.template_pack)
+            timeout = getattr(helper, "render_cache", None)
+
+        if timeout is None or timeout is False:
+            return self.render_form(context)
+        if timeout is True:
+            timeout = DEFAULT_TIMEOUT
+        if getattr(helper, "render_cache_skeleton", False) and helper.layout:
+            if not isinstance(actual_form, BaseFormSet):
+                return self.render_skeleton_cached(context, actual_form, helper, template_pack, timeout)
+        if actual_form.is_bound:
+            return self.render_form(context)
+        return self.render_cached(context, actual_form, helper, template_pack, timeout)
+
+    def render_form(self, context):
+        node_context, helper, template_pack = self.get_render_state(context)
+        c = node_context.flatten()
+        return self.get_form_template(helper, c["is_formset"], template_pack).render(c)
+
+    def render_skeleton_cached(self, context, form, helper, template_pack, timeout):
+        """
+        Renders a form whose layout's skeleton goes through the render cache, see
+        `crispy_forms.cache.Skeleton`. Fields, dynamic `HTML` objects and everything out of
+        the layout, like the CSRF token or form errors, are rendered for every request.
+        """
+        node_context, helper, template_pack = self.get_render_state(context, render_layout=False)
+        try:
+            key = get_cache_key(form, helper, template_pack, False, False, skeleton=True)
+        except DescriptionError:
+            # The helper holds values without a stable description, like lambdas
+            return self.render_form(context)
+        cache = get_render_cache()
+
+        html, skeleton = cache.get(key, (None, None))
+        if skeleton is None:
+            skeleton = form.crispy_skeleton = Skeleton()
+            try:
+                html = helper.render_layout(form, node_context, template_pack=template_pack)
+            finally:
+                del form.crispy_skeleton
+            cache.set(key, (html, skeleton) if skeleton.cacheable else (None, False), timeout)
+
+        if skeleton is False:
+            # The layout can't be rendered as a skeleton
+            form.form_html = helper.render_layout(form, node_context, template_pack=template_pack)
+        else:
+            form.rendered_fields = set()
+            form.crispy_field_template = helper.field_template
+            form.form_html = skeleton.fill(html, form, node_context)
+
+        c = node_context.flatten()
+        return self.get_form_template(helper, False, template_pack).render(c)
+
+    def render_cached(self, context, form, helper, template_pack, timeout):
+        """
+        Renders an unbound form through the render cache, see `crispy_forms.cache`. The form
+        is rendered with a placeholder CSRF token, replaced by the real one after lookup.
+        """
+        csrf = "csrf_token" in context
+        is_formset = isinstance(form, BaseFormSet)
+        try:
+            key = get_cache_key(form, helper, template_pack, is_formset, csrf)
+        except DescriptionError:
+            # The helper or the form hold values without a stable description, like lambdas
+            return self.render_form(context)
+        cache = get_render_cache()
+
+        html = cache.get(key)
+        if html is None:
+            if csrf:
+                with context.push(csrf_token=CSRF_PLACEHOLDER):
+                    html = self.render_form(context)
+            else:
+                html = self.render_form(context)
+            cache.set(key, html, timeout)
+
+        if csrf and CSRF_PLACEHOLDER in html:
+            html = html.replace(CSRF_PLACEHOLDER, str(context["csrf_token"]))
+        return SafeString(html)
+
+    def get_form_template(self, helper, is_formset, template_pack):
+        if helper is not None and getattr(helper, "template", False):
+            return load_template(helper.template)
+        if is_formset:
+            return whole_uni_formset_template(template_pack)
+        return whole_uni_form_template(template_pack)
+
+    async def arender(self, context):
+        """
+        Asynchronous version of `render`, the helper's layout is rendered with `arender_layout`.
+        Formset forms are rendered one after the other. Everything else is rendered in a
+        thread, through `sync_to_async`, as forms and formsets may query the database.
+        """
+        node_context, helper, template_pack = await sync_to_async(self.get_render_state)(context, render_layout=False)
+        is_formset = node_context["is_formset"]
+
+        if helper and helper.layout:
+            if not is_formset:
+                form = node_context["form"]
+                form.form_html = await helper.arender_layout(form, node_context, template_pack=template_pack)
             else:
-                template = whole_uni_form_template(self.template_pack)
-        return template.render(c)
+                formset = node_context["formset"]
+                # Model formsets build their forms from a queryset
+                await sync_to_async(lambda: formset.forms)()
+                for form in self.iter_formset_forms(formset, node_context):
+                    form.form_html = await helper.arender_layout(
+                        form, node_context, template_pack=template_pack, render_hidden_fields=True
+                    )
+
+        c = node_context.flatten()
+        return await sync_to_async(self.get_form_template(helper, is_formset, template_pack).render)(c)
+
+    def iter_render(self, context):
+        """
+        Same as `render`, but yields the form in chunks: the markup before the layout, the html of
+        every top-level layout object, and the markup after it. Formsets yield every form's layout
+        in turn, with the markup between forms.
+
+        The markup around the layout is rendered first, with a marker in place of every
+        `form.form_html`. If there is no layout, or the template doesn't display the markers, the
+        form is yielded in one chunk.
+        """
+        node_context, helper, template_pack = self.get_render_state(context, render_layout=False)
+        c = node_context.flatten()
+        is_formset = c["is_formset"]
+        actual_form = c["formset"] if is_formset else c["form"]
+        template = self.get_form_template(helper, is_formset, template_pack)
+
+        if not (helper and helper.layout):
+            yield template.render(c)
+            return
+
+        forms = actual_form.forms if is_formset else [actual_form]
+        marker = SafeString("crispy-form-html-%s" % uuid4().hex)
+        for form in forms:
+            form.form_html = marker
+        chunks = template.render(c).split(marker)
+        for form in forms:
+            del form.form_html
+
+        if len(chunks) != len(forms) + 1:
+            yield self.render(context)
+            return
+
+        yield chunks[0]
+        if is_formset:
+            for form, chunk in zip(self.iter_formset_forms(actual_form, node_context), chunks[1:]):
+                yield from helper.iter_render_layout(
+                    form, node_context, template_pack=template_pack, render_hidden_fields=True
+                )
+                yield chunk
+        else:
+            yield from helper.iter_render_layout(actual_form, node_context, template_pack=template_pack)
+            yield chunks[1]
 
 
 # {% crispy %} tag
@@ -226,12 +425,25 @@ def do_uni_form(parser, token):
 
         {% crispy form form.helper 'bootstrap' %}
 
+    Unbound forms can be cached for a number of seconds, see `crispy_forms.cache`::
+
+        {% crispy form form.helper cache=300 %}
+
     If the `FormHelper` attribute is named `helper` you can simply do::
 
         {% crispy form %}
         {% crispy form 'bootstrap' %}
     """
     tokens = token.split_contents()
+
+    # {% crispy form helper cache=300 %}
+    cache_timeout = None
+    for bit in tokens[1:]:
+        if bit.startswith("cache="):
+            cache_timeout = parser.compile_filter(bit.split("=", 1)[1])
+            tokens.remove(bit)
+            break
+
     form = tokens.pop(1)
 
     helper = None
@@ -264,4 +476,4 @@ def do_uni_form(parser, token):
                 "crispy tag's template_pack argument should be in %s" % str(ALLOWED_TEMPLATE_PACKS)
             )
 
-    return CrispyFormNode(form, helper, template_pack=template_pack)
+    return CrispyFormNode(form, helper, template_pack=template_pack, cache_timeout=cache_timeout)
@@ -1,16 +1,21 @@
 import logging
 import sys
+import threading
+from collections import OrderedDict
 from functools import lru_cache
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.forms.utils import flatatt as _flatatt
-from django.template import Context
+from django.template import Context, Engine, Template, engines
+from django.template.backends.django import DjangoTemplates
 from django.template.loader import get_template
+from django.utils.autoreload import file_changed
 from django.utils.functional import SimpleLazyObject
 from django.utils.safestring import SafeString
 
-from .base import KeepContext
-
 
 def get_template_pack():
     return getattr(settings, "CRISPY_TEMPLATE_PACK")
@@ -19,11 +24,206 @@ def get_template_pack():
 TEMPLATE_PACK = SimpleLazyObject(get_template_pack)
 
 
-# By caching we avoid loading the template every time render_field
-# is called without a template
-@lru_cache
+class TemplateCache:
+    """
+    Bounded, thread-safe cache of compiled templates, also used for other values built
+    once per key, like the layouts of `FormHelper.transform_layout`.
+
+    The least recently used template is evicted once the cache holds more than
+    `maxsize` templates. If `maxsize` is None, `CRISPY_TEMPLATE_CACHE_SIZE` setting
+    is used (512 by default). Hits, misses and evictions are counted, see `stats()`.
+    `generation` grows every time it's cleared, so values built from its templates can
+    tell they're stale.
+    """
+
+    def __init__(self, maxsize=None):
+        self._maxsize = maxsize
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+
+    @property
+    def maxsize(self):
+        if self._maxsize is None:
+            return getattr(settings, "CRISPY_TEMPLATE_CACHE_SIZE", 512)
+        return self._maxsize
+
+    def get(self, key, compile_function):
+        """
+        Returns the template cached under `key`, calling `compile_function` to build it
+        when it's not cached yet.
+        """
+        with self._lock:
+            try:
+                template = self._templates[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+
+        # Compiling happens outside of the lock, two threads may compile the same template
+        template = compile_function()
+
+        with self._lock:
+            self._templates[key] = template
+            maxsize = self.maxsize
+            while len(self._templates) > maxsize:
+                self._templates.popitem(last=False)
+                self.evictions += 1
+
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.generation += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._templates),
+                "maxsize": self.maxsize,
+            }
+
+
+compiled_templates = TemplateCache()
+loaded_templates = TemplateCache()
+
+
+@lru_cache(maxsize=None)
+def get_template_engine_alias():
+    """
+    Returns `CRISPY_TEMPLATE_ENGINE` setting, or None if it isn't set. It's read once,
+    until the setting changes, as looking up a missing setting isn't cheap.
+    """
+    return getattr(settings, "CRISPY_TEMPLATE_ENGINE", None)
+
+
+def get_template_engine():
+    """
+    Returns the template engine named by `CRISPY_TEMPLATE_ENGINE` setting, an alias of
+    `TEMPLATES` setting like "django" or "jinja2", or None if it isn't set, in which case
+    templates are looked up in all engines and template code is Django template code.
+    """
+    alias = get_template_engine_alias()
+    return engines[alias] if alias else None
+
+
+def load_template(template_name):
+    """
+    Returns the template `template_name` found by Django's template loaders, or those of
+    the engine set by `CRISPY_TEMPLATE_ENGINE`.
+
+    Loaded templates are kept in `loaded_templates`, keyed by engine alias and name, so
+    looking them up again doesn't go through the loaders. It's cleared when `TEMPLATES`,
+    `CRISPY_TEMPLATE_ENGINE` or `CRISPY_TEMPLATE_CACHE_SIZE` settings change and when
+    the autoreloader sees a template change.
+    """
+    alias = get_template_engine_alias()
+
+    def load():
+        if not alias:
+            return get_template(template_name)
+        return engines[alias].get_template(template_name)
+
+    return loaded_templates.get((alias, template_name), load)
+
+
+pack_template_functions = []
+
+
+def pack_template(function):
+    """
+    Memoizes `function`, which returns one of the templates of the pack it's given, like
+    `default_field_template`, so it costs a dictionary lookup. It's cleared along with
+    `loaded_templates`.
+    """
+    function = lru_cache(maxsize=None)(function)
+    pack_template_functions.append(function)
+    return function
+
+
+def clear_loaded_templates():
+    loaded_templates.clear()
+    for function in pack_template_functions:
+        function.cache_clear()
+
+
+@receiver(setting_changed)
+def clear_template_caches_on_setting_changed(*, setting, **kwargs):
+    if setting in ("TEMPLATES", "CRISPY_TEMPLATE_CACHE_SIZE", "CRISPY_TEMPLATE_ENGINE"):
+        get_template_engine_alias.cache_clear()
+        compiled_templates.clear()
+        clear_loaded_templates()
+    elif setting == "CRISPY_NATIVE_RENDERING":
+        # Render plans hold the native renderers or the templates of layout objects
+        clear_loaded_templates()
+
+
+@receiver(file_changed)
+def clear_template_caches_on_file_changed(*, file_path, **kwargs):
+    # Django's autoreloader resets its template loaders when a template changes, returning
+    # None lets it restart the server for Python files
+    if file_path.suffix != ".py":
+        clear_loaded_templates()
+
+
+def is_template_code(string):
+    """
+    Returns whether `string` holds any template syntax, `{{`, `{%` or `{#`.
+    """
+    return "{{" in string or "{%" in string or "{#" in string
+
+
+def render_template_string(template_string, context):
+    """
+    Renders `template_string` as a Django template with `context`, or as a template of the
+    engine set by `CRISPY_TEMPLATE_ENGINE`, like Jinja2, with the flattened `context`.
+
+    Templates are compiled once and kept in `compiled_templates`, keyed by source and
+    engine. Strings without any template syntax are returned as they are, marked safe,
+    just like rendering them as a template would do.
+    """
+    template_string = str(template_string)
+    if not is_template_code(template_string):
+        return SafeString(template_string)
+
+    backend = get_template_engine()
+    if backend is not None and not isinstance(backend, DjangoTemplates):
+        template = compiled_templates.get((backend, template_string), lambda: backend.from_string(template_string))
+        return SafeString(template.render(context.flatten()))
+
+    engine = Engine.get_default() if backend is None else backend.engine
+    template = compiled_templates.get((engine, template_string), lambda: Template(template_string, engine=engine))
+    return template.render(context)
+
+
+def render_template_code(template_string, form, context):
+    """
+    Renders `template_string`, the template code of a layout object like an `HTML` object's
+    content or a `Fieldset` legend, with `context`, see `render_template_string`.
+
+    While the layout's skeleton is rendered, template code is replaced by a placeholder, as
+    its output may depend on the request, see `crispy_forms.cache.Skeleton`.
+    """
+    skeleton = getattr(form, "crispy_skeleton", None)
+    if skeleton is not None and is_template_code(str(template_string)):
+        return skeleton.add_html(str(template_string))
+    return render_template_string(template_string, context)
+
+
+@pack_template
 def default_field_template(template_pack=TEMPLATE_PACK):
-    return get_template("%s/field.html" % template_pack)
+    return load_template("%s/field.html" % template_pack)
 
 
 def render_field(
@@ -54,89 +254,113 @@ def render_field(
     :template_pack: Name of the template pack to be used for rendering `field`
     :extra_context: Dictionary to be added to context, added variables by the layout object
     """
-    added_keys = [] if extra_context is None else extra_context.keys()
-    with KeepContext(context, added_keys):
-        if field is None:
-            return SafeString("")
+    if field is None:
+        return SafeString("")
 
-        FAIL_SILENTLY = getattr(settings, "CRISPY_FAIL_SILENTLY", True)
+    FAIL_SILENTLY = getattr(settings, "CRISPY_FAIL_SILENTLY", True)
 
-        if hasattr(field, "render"):
-            return field.render(form, context, template_pack=template_pack)
+    if hasattr(field, "render"):
+        return field.render(form, context, template_pack=template_pack)
 
-        try:
-            # Injecting HTML attributes into field's widget, Django handles rendering these
-            bound_field = form[field]
-            field_instance = bound_field.field
-            if attrs is not None:
-                widgets = getattr(field_instance.widget, "widgets", [field_instance.widget])
+    try:
+        # Injecting HTML attributes into field's widget, Django handles rendering these
+        bound_field = form[field]
+        field_instance = bound_field.field
+        if attrs is not None:
+            widgets = getattr(field_instance.widget, "widgets", [field_instance.widget])
 
-                # We use attrs as a dictionary later, so here we make a copy
-                list_attrs = attrs
-                if isinstance(attrs, dict):
-                    list_attrs = [attrs] * len(widgets)
+            # We use attrs as a dictionary later, so here we make a copy
+            list_attrs = attrs
+            if isinstance(attrs, dict):
+                list_attrs = [attrs] * len(widgets)
 
-                for index, (widget, attr) in enumerate(zip(widgets, list_attrs)):
-                    if hasattr(field_instance.widget, "widgets"):
-                        if "type" in attr and attr["type"] == "hidden":
-                            field_instance.widget.widgets[index] = field_instance.hidden_widget(attr)
+            for index, (widget, attr) in enumerate(zip(widgets, list_attrs)):
+                if hasattr(field_instance.widget, "widgets"):
+                    if "type" in attr and attr["type"] == "hidden":
+                        field_instance.widget.widgets[index] = field_instance.hidden_widget(attr)
 
-                        else:
-                            field_instance.widget.widgets[index].attrs.update(attr)
                     else:
-                        if "type" in attr and attr["type"] == "hidden":
-                            field_instance.widget = field_instance.hidden_widget(attr)
+                        field_instance.widget.widgets[index].attrs.update(attr)
+                else:
+                    if "type" in attr and attr["type"] == "hidden":
+                        field_instance.widget = field_instance.hidden_widget(attr)
 
-                        else:
-                            field_instance.widget.attrs.update(attr)
+                    else:
+                        field_instance.widget.attrs.update(attr)
 
-        except KeyError:
-            if not FAIL_SILENTLY:
-                raise Exception("Could not resolve form field '%s'." % field)
-            else:
-                field_instance = None
-                logging.warning("Could not resolve form field '%s'." % field, exc_info=sys.exc_info())
+    except KeyError:
+        if not FAIL_SILENTLY:
+            raise Exception("Could not resolve form field '%s'." % field)
+        else:
+            field_instance = None
+            logging.warning("Could not resolve form field '%s'." % field, exc_info=sys.exc_info())
 
-        if hasattr(form, "rendered_fields"):
-            if field not in form.rendered_fields:
-                form.rendered_fields.add(field)
+    if hasattr(form, "rendered_fields"):
+        if field not in form.rendered_fields:
+            form.rendered_fields.add(field)
+        else:
+            if not FAIL_SILENTLY:
+                raise Exception("A field should only be rendered once: %s" % field)
             else:
-                if not FAIL_SILENTLY:
-                    raise Exception("A field should only be rendered once: %s" % field)
-                else:
-                    logging.warning("A field should only be rendered once: %s" % field, exc_info=sys.exc_info())
+                logging.warning("A field should only be rendered once: %s" % field, exc_info=sys.exc_info())
+
+    skeleton = getattr(form, "crispy_skeleton", None)
+    if skeleton is not None:
+        if layout_object is None:
+            # Fields missing from the form get a placeholder too, another form may have them
+            return skeleton.add_field(
+                field,
+                template=template,
+                labelclass=labelclass,
+                attrs=attrs,
+                template_pack=template_pack,
+                extra_context=extra_context,
+            )
+        # The layout object renders the bound field itself
+        skeleton.cacheable = False
 
-        if field_instance is None:
-            html = SafeString("")
+    if field_instance is None:
+        html = SafeString("")
+    else:
+        if template is None:
+            if form.crispy_field_template is None:
+                template = default_field_template(template_pack)
+            else:  # FormHelper.field_template set
+                template = load_template(form.crispy_field_template)
         else:
-            if template is None:
-                if form.crispy_field_template is None:
-                    template = default_field_template(template_pack)
-                else:  # FormHelper.field_template set
-                    template = get_template(form.crispy_field_template)
+            template = load_template(template)
+
+        # We save the Layout object's bound fields in the layout object's `bound_fields` list
+        if layout_object is not None:
+            if hasattr(layout_object, "bound_fields") and isinstance(layout_object.bound_fields, list):
+                layout_object.bound_fields.append(bound_field)
             else:
-                template = get_template(template)
+                layout_object.bound_fields = [bound_field]
+
+        field_context = {
+            "field": bound_field,
+            "labelclass": labelclass,
+            "flat_attrs": flatatt(attrs if isinstance(attrs, dict) else {}),
+        }
+        if extra_context is not None:
+            field_context.update(extra_context)
+
+        # The field's variables are only pushed to the context while rendering it
+        with context.push(field_context):
+            html = template.render(context.flatten())
 
-            # We save the Layout object's bound fields in the layout object's `bound_fields` list
-            if layout_object is not None:
-                if hasattr(layout_object, "bound_fields") and isinstance(layout_object.bound_fields, list):
-                    layout_object.bound_fields.append(bound_field)
-                else:
-                    layout_object.bound_fields = [bound_field]
-
-            context.update(
-                {
-                    "field": bound_field,
-                    "labelclass": labelclass,
-                    "flat_attrs": flatatt(attrs if isinstance(attrs, dict) else {}),
-                }
-            )
-            if extra_context is not None:
-                context.update(extra_context)
+    return html
 
-            html = template.render(context.flatten())
 
-        return html
+async def arender_field(field, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+    """
+    Asynchronous version of `render_field`. Layout objects having an `arender` method are
+    awaited, anything else is rendered by `render_field` in a thread, through
+    `sync_to_async`, as fields like a `ModelChoiceField` query the database.
+    """
+    if hasattr(field, "arender"):
+        return await field.arender(form, context, template_pack=template_pack)
+    return await sync_to_async(render_field)(field, form, context, template_pack=template_pack, **kwargs)
 
 
 def flatatt(attrs):
@@ -168,6 +392,61 @@ def render_crispy_form(form, helper=None, context=None):
     return node.render(node_context)
 
 
+async def arender_crispy_form(form, helper=None, context=None):
+    """
+    Asynchronous version of `render_crispy_form`. Layout objects are rendered with their
+    `arender` method, so they can await I/O without blocking the event loop.
+    """
+    from crispy_forms.templatetags.crispy_forms_tags import CrispyFormNode
+
+    if helper is not None:
+        node = CrispyFormNode("form", "helper")
+    else:
+        node = CrispyFormNode("form", None)
+
+    node_context = Context(context)
+    node_context.update({"form": form, "helper": helper})
+
+    return await node.arender(node_context)
+
+
+def iter_render_crispy_form(form, helper=None, context=None):
+    """
+    Same as `render_crispy_form`, but yields the HTML output in chunks: the opening markup,
+    every top-level layout object (or every formset form), and the closing markup.
+
+    Chunks are yielded as soon as they are rendered, so they can be passed to a
+    `StreamingHttpResponse`.
+    """
+    from crispy_forms.templatetags.crispy_forms_tags import CrispyFormNode
+
+    if helper is not None:
+        node = CrispyFormNode("form", "helper")
+    else:
+        node = CrispyFormNode("form", None)
+
+    node_context = Context(context)
+    node_context.update({"form": form, "helper": helper})
+
+    yield from node.iter_render(node_context)
+
+
+async def aiter_render_crispy_form(form, helper=None, context=None):
+    """
+    Asynchronous version of `iter_render_crispy_form`, for streaming responses of ASGI views.
+
+    Every chunk is rendered by `sync_to_async`, so rendering, including database queries of
+    fields like `ModelChoiceField`, doesn't block the event loop.
+    """
+    chunks = iter_render_crispy_form(form, helper=helper, context=context)
+    next_chunk = sync_to_async(next)
+    while True:
+        chunk = await next_chunk(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
 def list_intersection(list1, list2):
     """
     Take the not-in-place intersection of two lists, similar to sets but preserving order.
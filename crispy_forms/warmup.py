@@ -0,0 +1,70 @@
+"""
+Loading templates and rendering forms ahead of the first requests, so that every process
+starts with warm template caches, see `warm_up`.
+"""
+
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.autoreload import get_template_directories
+from django.utils.module_loading import import_string
+
+from crispy_forms.utils import get_template_pack, load_template, render_crispy_form
+
+logger = logging.getLogger(__name__)
+
+
+def get_pack_template_names(template_pack):
+    """
+    Returns the names of the templates of `template_pack` found in the template directories
+    of every template engine.
+    """
+    template_names = set()
+    for directory in get_template_directories():
+        for path in (Path(directory) / template_pack).rglob("*.html"):
+            template_names.add(path.relative_to(directory).as_posix())
+    return sorted(template_names)
+
+
+def warm_up(template_packs=None, forms=None):
+    """
+    Loads and compiles all the templates of `template_packs`, and renders an unbound
+    instance of every form of `forms`, form classes or dotted paths to them, so that their
+    helpers and template code get cached too.
+
+    `template_packs` defaults to `CRISPY_ALLOWED_TEMPLATE_PACKS` setting, or the template
+    pack in use if it isn't set, and `forms` to `CRISPY_WARMUP_FORMS` setting.
+
+    Returns a `(warmed_up, failures)` tuple: the names of the templates and forms warmed up,
+    and `(name, exception)` tuples for those that failed, which are logged too.
+    """
+    if template_packs is None:
+        template_packs = getattr(settings, "CRISPY_ALLOWED_TEMPLATE_PACKS", [get_template_pack()])
+    if forms is None:
+        forms = getattr(settings, "CRISPY_WARMUP_FORMS", [])
+
+    warmed_up, failures = [], []
+    for template_pack in template_packs:
+        for template_name in get_pack_template_names(template_pack):
+            try:
+                load_template(template_name)
+            except (TemplateDoesNotExist, TemplateSyntaxError) as e:
+                failures.append((template_name, e))
+            else:
+                warmed_up.append(template_name)
+
+    for form in forms:
+        name = form if isinstance(form, str) else "%s.%s" % (form.__module__, form.__qualname__)
+        try:
+            form_class = import_string(form) if isinstance(form, str) else form
+            render_crispy_form(form_class())
+        except Exception as e:
+            failures.append((name, e))
+        else:
+            warmed_up.append(name)
+
+    for name, e in failures:
+        logger.warning("crispy-forms couldn't warm up %s: %s", name, e)
+    return warmed_up, failures
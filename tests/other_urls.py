@@ -0,0 +1,6 @@
+from django.urls import path
+from django.views.generic import View
+
+urlpatterns = [
+    path("other/action/", View.as_view(), name="simpleAction"),
+]
@@ -0,0 +1,77 @@
+import pytest
+
+from crispy_forms.bench import compare, measure, parse_import_time
+from crispy_forms.bench.__main__ import main
+
+
+def test_measure():
+    calls = []
+    result = measure(lambda: calls.append(bytearray(100_000)), rounds=3)
+
+    # one warm up call, one to measure memory, then the rounds
+    assert len(calls) == 5
+    assert result["rounds"] == 3
+    assert result["p50"] <= result["p95"]
+    assert result["ops_per_sec"] > 0
+    assert result["memory_peak"] >= 100_000
+
+
+def test_measure_timer():
+    result = measure(lambda: 0.5, rounds=3, timer=True)
+    assert result["p50"] == result["p95"] == 0.5
+    assert result["ops_per_sec"] == 2
+
+
+def test_parse_import_time():
+    output = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   django.template
+import time:       300 |        400 | crispy_forms
+import time:        50 |         50 |     crispy_forms.exceptions
+import time:       200 |        200 |     django.forms
+import time:      1000 |       1250 |   crispy_forms.utils
+import time:       500 |       1750 | crispy_forms.templatetags.crispy_forms_tags
+import time:        80 |         80 | json
+"""
+    # crispy_forms.utils and crispy_forms.exceptions are within crispy_forms_tags
+    assert parse_import_time(output, "crispy_forms") == 0.00215
+
+
+def test_compare():
+    def results(fieldset_p50, tabholder_memory):
+        return {
+            "results": [
+                {"scenario": "Fieldset", "template_pack": "bootstrap3", "p50": fieldset_p50, "memory_peak": 1000},
+                {"scenario": "TabHolder", "template_pack": "bootstrap3", "p50": 0.01, "memory_peak": tabholder_memory},
+            ]
+        }
+
+    lines, regressions = compare(results(0.01, 1000), results(0.0105, 900), threshold=10)
+    assert regressions == []
+    assert len(lines) == 5
+
+    lines, regressions = compare(results(0.01, 1000), results(0.02, 1200), threshold=10)
+    assert regressions == [("Fieldset", "bootstrap3", "p50", 100.0), ("TabHolder", "bootstrap3", "memory_peak", 20.0)]
+    assert "Fieldset" in lines[1] and "REGRESSION" in lines[1]
+
+
+def test_compare_budget():
+    def results(p50):
+        return {
+            "results": [
+                {"scenario": "template_tags_import", "template_pack": "bootstrap3", "p50": p50, "memory_peak": 1000}
+            ]
+        }
+
+    current = results(0.03)
+    current["results"][0]["budget"] = 0.02
+    lines, regressions = compare({"results": []}, current)
+    assert regressions == [("template_tags_import", "bootstrap3", "budget", pytest.approx(50.0))]
+    assert "OVER BUDGET" in lines[1]
+
+
+def test_scenarios_and_settings_required(monkeypatch, capsys):
+    monkeypatch.delenv("DJANGO_SETTINGS_MODULE")
+    with pytest.raises(SystemExit):
+        main(["run"])
+    assert "--scenarios, --settings" in capsys.readouterr().err
@@ -0,0 +1,266 @@
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+from django import forms
+from django.core.cache import cache
+from django.forms import BaseFormSet, formset_factory
+from django.template import Context, Template
+from django.utils import translation
+
+from crispy_forms.bootstrap import PrependedText, StrictButton, Tab, TabHolder
+from crispy_forms.cache import CSRF_PLACEHOLDER, Skeleton, describe, describe_fields
+from crispy_forms.exceptions import DescriptionError
+from crispy_forms.helper import FormHelper
+from crispy_forms.layout import HTML, Div, Field, Fieldset, Layout, Submit
+from crispy_forms.utils import render_crispy_form, render_field
+
+from .forms import SampleForm
+from .utils import parse_html
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class CountingHTML(HTML):
+    renders = 0
+
+    def render(self, form, context, **kwargs):
+        CountingHTML.renders += 1
+        return super().render(form, context, **kwargs)
+
+
+def cached_helper():
+    CountingHTML.renders = 0
+    helper = FormHelper()
+    helper.render_cache = 60
+    helper.layout = Layout("email", CountingHTML("<p>counted</p>"))
+    return helper
+
+
+def test_render_cache():
+    helper = cached_helper()
+
+    first = render_crispy_form(SampleForm(), helper, {"csrf_token": "firstToken"})
+    second = render_crispy_form(SampleForm(), helper, {"csrf_token": "secondToken"})
+    assert CountingHTML.renders == 1
+    assert 'value="firstToken"' in first
+    assert 'value="secondToken"' in second
+    assert CSRF_PLACEHOLDER not in second
+    assert first.replace("firstToken", "secondToken") == second
+
+    # Changing the layout, the language or the form prefix renders the form again
+    helper.layout.append("password1")
+    render_crispy_form(SampleForm(), helper)
+    with translation.override("es"):
+        render_crispy_form(SampleForm(), helper)
+    render_crispy_form(SampleForm(prefix="other"), helper)
+    assert CountingHTML.renders == 4
+
+
+def test_render_cache_formset_forms_data():
+    rows = ["first@example.com"]
+
+    class RowFormSet(BaseFormSet):
+        # Like model formsets, forms get their initial data from rows read by the formset
+        def total_form_count(self):
+            return len(rows)
+
+        def get_form_kwargs(self, index):
+            return {"initial": {"email": rows[index]}}
+
+        def get_form_kwargs_empty(self):
+            return {}
+
+    RowSampleFormSet = formset_factory(SampleForm, formset=RowFormSet, extra=0)
+    helper = cached_helper()
+    assert "first@example.com" in render_crispy_form(RowSampleFormSet(), helper)
+
+    rows[0] = "second@example.com"
+    html = render_crispy_form(RowSampleFormSet(), helper)
+    assert "second@example.com" in html
+    assert "first@example.com" not in html
+
+
+def test_render_cache_form_fields():
+    class UserForm(forms.Form):
+        name = forms.CharField()
+        secret = forms.CharField()
+        color = forms.ChoiceField(choices=[])
+
+        def __init__(self, user, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if not user["staff"]:
+                del self.fields["secret"]
+            self.fields["color"].choices = user["colors"]
+
+    helper = FormHelper()
+    helper.render_cache = 60
+    helper.layout = Layout("name", "secret", "color")
+
+    staff = render_crispy_form(UserForm({"staff": True, "colors": [("red", "Red")]}), helper)
+    other = render_crispy_form(UserForm({"staff": False, "colors": [("blue", "Blue")]}), helper)
+    assert 'name="secret"' in staff and 'value="red"' in staff
+    assert 'name="secret"' not in other and 'value="red"' not in other
+    assert 'value="blue"' in other
+
+
+def test_describe_fields_model_choices():
+    from django.contrib.auth.models import Group
+
+    def group_form(queryset):
+        form = SampleForm()
+        form.fields["group"] = forms.ModelChoiceField(queryset=queryset)
+        return form
+
+    # Model choices are told apart by their query, without running it, as tests can't
+    # access the database
+    assert describe_fields(group_form(Group.objects.filter(name="first"))) != describe_fields(
+        group_form(Group.objects.filter(name="second"))
+    )
+    describe_fields(group_form(Group.objects.none()))
+
+
+def test_helper_fingerprint_memoized():
+    helper = cached_helper()
+    fingerprint = helper.fingerprint()
+    with patch("crispy_forms.helper.describe", side_effect=AssertionError):
+        assert helper.fingerprint() == fingerprint
+
+    helper.attrs["data-test"] = "value"
+    assert helper.fingerprint() != fingerprint
+    fingerprint = helper.fingerprint()
+    helper.layout.append("password2")
+    assert helper.fingerprint() != fingerprint
+
+
+def test_describe_callables():
+    assert describe(render_field) == "crispy_forms.utils.render_field"
+    assert describe(render_crispy_form) != describe(render_field)
+    assert describe(len) == "builtins.len"
+    assert describe(partial(render_field, "email")) != describe(partial(render_field, "password1"))
+    assert describe(SampleForm().clean) == describe(SampleForm().clean)
+
+    # Lambdas, nested functions and objects repr'ed by their address differ in every process
+    for value in (lambda: None, test_describe_callables.__code__.replace, object()):
+        with pytest.raises(DescriptionError):
+            describe(value)
+
+    def nested():
+        pass
+
+    with pytest.raises(DescriptionError):
+        describe(nested)
+
+
+def test_render_cache_skips_undescribed_helpers():
+    helper = cached_helper()
+    helper.formatter = lambda value: value
+
+    render_crispy_form(SampleForm(), helper)
+    render_crispy_form(SampleForm(), helper)
+    assert CountingHTML.renders == 2
+
+
+def test_render_cache_skips_bound_forms():
+    helper = cached_helper()
+
+    render_crispy_form(SampleForm(data={"email": "invalid"}), helper)
+    html = render_crispy_form(SampleForm(data={"email": "other"}), helper)
+    assert CountingHTML.renders == 2
+    assert 'value="other"' in html
+
+
+def test_crispy_tag_cache_argument():
+    helper = cached_helper()
+    helper.render_cache = None
+    template = Template(
+        """
+        {% load crispy_forms_tags %}
+        {% crispy form helper cache=timeout %}
+    """
+    )
+
+    template.render(Context({"form": SampleForm(), "helper": helper, "timeout": 300}))
+    template.render(Context({"form": SampleForm(), "helper": helper, "timeout": 300}))
+    assert CountingHTML.renders == 1
+
+    template.render(Context({"form": SampleForm(), "helper": helper, "timeout": None}))
+    assert CountingHTML.renders == 2
+
+
+def test_render_cache_skeleton():
+    def skeleton_helper(render_cache):
+        CountingHTML.renders = 0
+        helper = FormHelper()
+        helper.render_cache = render_cache
+        helper.render_cache_skeleton = True
+        helper.layout = Layout(
+            Fieldset("Account of {{ greeting }}", Field("email", css_class="email"), PrependedText("first_name", "@")),
+            Div("password1", "password2", CountingHTML("<p>static</p>")),
+            HTML("<p>{{ greeting }}</p>"),
+            Submit("save", "Save {{ greeting }}"),
+            StrictButton("Go {{ greeting }}"),
+        )
+        return helper
+
+    helper = skeleton_helper(60)
+    uncached_helper = skeleton_helper(None)
+    requests = [
+        (SampleForm(), {"greeting": "Hello", "csrf_token": "firstToken"}),
+        (SampleForm(data={"email": "invalid", "first_name": "toolongname"}), {"greeting": "Hi"}),
+        (SampleForm(data={"email": "john@example.com", "password1": "a", "password2": "b"}), {"greeting": "Hey"}),
+    ]
+    for form, context in requests:
+        html = render_crispy_form(form, helper, context)
+        form = SampleForm(data=form.data) if form.is_bound else SampleForm()
+        assert parse_html(html) == parse_html(render_crispy_form(form, uncached_helper, context))
+
+    assert CountingHTML.renders == 1 + len(requests)
+
+
+def test_render_cache_skeleton_form_fields():
+    class UserForm(forms.Form):
+        name = forms.CharField()
+        secret = forms.CharField()
+        hidden = forms.CharField(widget=forms.HiddenInput)
+
+        def __init__(self, staff, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if not staff:
+                del self.fields["secret"]
+                del self.fields["hidden"]
+
+    helper = FormHelper()
+    helper.render_cache = 60
+    helper.render_cache_skeleton = True
+    helper.render_hidden_fields = True
+    helper.layout = Layout("name", "secret")
+
+    other = render_crispy_form(UserForm(staff=False), helper)
+    staff = render_crispy_form(UserForm(staff=True), helper)
+    assert 'name="secret"' not in other and 'name="hidden"' not in other
+    assert 'name="secret"' in staff and 'name="hidden"' in staff
+
+    # Fields missing from the form are placeholders of the skeleton too
+    form = UserForm(staff=False)
+    form.crispy_skeleton = Skeleton()
+    assert render_field("secret", form, Context()).startswith(form.crispy_skeleton.marker)
+
+
+def test_render_cache_skeleton_not_cacheable():
+    CountingHTML.renders = 0
+    helper = FormHelper()
+    helper.render_cache = 60
+    helper.render_cache_skeleton = True
+    helper.layout = Layout(TabHolder(Tab("one", "email", CountingHTML("<p>tab</p>")), Tab("two", "password1")))
+
+    render_crispy_form(SampleForm(), helper)
+    html = render_crispy_form(SampleForm(data={"email": "john@example.com"}), helper)
+    assert CountingHTML.renders == 2
+    # The tab holding errors is the active one
+    assert parse_html('<li class="tab-pane active"><a href="#two" data-toggle="tab">Two</a></li>') in parse_html(html)
@@ -1,10 +1,15 @@
+import pickle
+
 import pytest
 from django import forms
+from django.template import Context
 
 from crispy_forms.bootstrap import AppendedText
+from crispy_forms.cache import versions
 from crispy_forms.exceptions import DynamicError
 from crispy_forms.helper import FormHelper, FormHelpersException
-from crispy_forms.layout import HTML, Div, Field, Fieldset, Layout, MultiField, Pointer
+from crispy_forms.layout import HTML, Div, Field, Fieldset, Layout, MultiField, Pointer, Submit
+from crispy_forms.utils import TemplateCache, render_crispy_form
 
 from .forms import SampleForm
 
@@ -224,6 +229,12 @@ def test_filter_and_wrap_side_effects():
     with pytest.raises(DynamicError):
         helper.filter(Div, max_level=2).wrap(Div, css_class="test-class")
 
+    helper.layout = Layout(Div("email"))
+    email = helper["email"]
+    del helper.layout[0]
+    with pytest.raises(DynamicError):
+        email.wrap(Field)
+
 
 def test_get_field_names():
     layout_1 = Div("field_name")
@@ -417,3 +428,252 @@ def test_filter():
         Pointer([1], "div"),
     ]
     assert helper.filter(MultiField, max_level=1).slice == [Pointer([0, 0], "multifield")]
+
+
+def test_layout_version():
+    helper = FormHelper()
+    helper.layout = Layout(Div("email", Div("password1")), "password2", Fieldset("legend", "first_name"))
+    inner_div = helper.layout[0][1]
+
+    def changes(operation):
+        versions = (helper.version, helper.layout.version)
+        operation()
+        return helper.version > versions[0] and helper.layout.version > versions[1]
+
+    assert changes(lambda: inner_div.insert(0, "datetime_field"))
+    assert changes(lambda: setattr(inner_div, "css_class", "inner"))
+    assert changes(lambda: helper.filter(str).wrap(Field))
+    assert changes(lambda: helper[1:3].wrap_once(Div))
+    assert changes(lambda: helper[0:2].wrap_together(Div))
+    assert changes(lambda: helper.filter(Field, greedy=True).update_attributes(css_class="updated"))
+    assert changes(lambda: helper.layout.__setitem__(0, "last_name"))
+    assert changes(lambda: helper.layout.__delitem__(0))
+    assert changes(lambda: helper.layout.append("is_company"))
+
+    version = helper.version
+    helper.add_input(Submit("save", "save"))
+    assert helper.version > version
+
+    # Reading the layout doesn't change its version
+    version = helper.version
+    helper.layout.get_field_names()
+    helper.render_layout(SampleForm(), Context({}))
+    assert helper.version == version
+
+
+def test_building_layout_takes_no_version_stamps():
+    stamp = next(versions)
+    helper = FormHelper()
+    helper.form_tag = False
+    helper.layout = Layout(Div("email", Fieldset("legend", Field("password1", css_class="input"))), "password2")
+    helper.layout[0].append("first_name")
+    helper.add_input(Submit("save", "save"))
+    assert next(versions) == stamp + 1
+
+    # Stamped on first read, then on every modification
+    version = helper.version
+    helper.layout[0][1].css_class = "legend"
+    assert helper.version > version
+
+
+def test_layout_fingerprint():
+    def build_helper():
+        helper = FormHelper()
+        helper.form_class = "form-horizontal"
+        helper.layout = Layout(
+            Fieldset("legend", Field("email"), Div("password1", css_class="passwords")), HTML("<hr>")
+        )
+        return helper
+
+    helper = build_helper()
+    assert helper.fingerprint() == build_helper().fingerprint()
+    assert helper.layout.fingerprint() == build_helper().layout.fingerprint()
+    assert pickle.loads(pickle.dumps(helper.layout)).fingerprint() == helper.layout.fingerprint()
+
+    helper.filter(Field, greedy=True).update_attributes(placeholder="email")
+    assert helper.layout.fingerprint() != build_helper().layout.fingerprint()
+
+    other = build_helper()
+    other.form_class = "form-inline"
+    assert other.fingerprint() != build_helper().fingerprint()
+    assert other.layout.fingerprint() == build_helper().layout.fingerprint()
+
+
+def test_layout_version_survives_pickling():
+    layout = pickle.loads(pickle.dumps(Layout(Div(Div("email")))))
+    version = layout.version
+    layout[0][0].append("password1")
+    assert layout.version > version
+
+
+def test_layout_index():
+    helper = FormHelper()
+    helper.layout = Layout(Div("email", Field("password1")), "password2")
+    index = helper.layout.get_index()
+    assert helper.layout.get_index() is index
+    assert helper.filter(Div, Field, greedy=True).slice == [Pointer([0], "div"), Pointer([0, 1], "field")]
+
+    helper.layout[0].append("first_name")
+    assert helper.layout.get_index() is not index
+    assert helper.layout.get_field_names() == [
+        Pointer([0, 0], "email"),
+        Pointer([0, 1, 0], "password1"),
+        Pointer([0, 2], "first_name"),
+        Pointer([1], "password2"),
+    ]
+    helper["first_name"].wrap(Field, css_class="name")
+    assert isinstance(helper.layout[0][2], Field)
+    assert helper["first_name"].slice == [Pointer([0, 2, 0], "first_name")]
+
+    # Attribute changes keep the index
+    index = helper.layout.get_index()
+    helper["first_name"].update_attributes(placeholder="name")
+    assert helper.layout.get_index() is index
+
+
+def test_layout_index_fields_modified_in_place():
+    layout = Layout(Div("email", Field("password1")), "password2")
+    layout.get_index()
+
+    layout.fields.append("first_name")
+    assert layout.get_field_names()[-1] == Pointer([2], "first_name")
+    layout[0].fields[1] = "last_name"
+    assert [pointer.name for pointer in layout.get_field_names()] == ["email", "last_name", "password2", "first_name"]
+    del layout.fields[0]
+    assert layout.get_field_names() == [Pointer([0], "password2"), Pointer([1], "first_name")]
+    layout.fields[:] = [Div("email")]
+    assert layout.get_field_names() == [Pointer([0, 0], "email")]
+    layout.fields = ["password1"]
+    assert layout.get_field_names() == [Pointer([0], "password1")]
+
+
+def test_iter_layout_objects():
+    layout = Layout(Div("email", Div("password1")), "password2")
+    assert list(layout.iter_layout_objects(str)) == [((0, 0), "email"), ((0, 1, 0), "password1"), ((1,), "password2")]
+    assert [positions for positions, _ in layout.iter_layout_objects(max_level=1)] == [(0,), (0, 0), (0, 1), (1,)]
+
+    # Deep layouts don't hit the recursion limit
+    deep_layout = Layout("email")
+    for _ in range(2000):
+        deep_layout = Layout(Div(deep_layout))
+    ((positions, field_name),) = deep_layout.iter_layout_objects(str)
+    assert field_name == "email" and len(positions) == 4001
+    assert deep_layout.get_field_names()[0].positions == list(positions)
+
+
+def test_pointers_survive_restructuring():
+    helper = FormHelper()
+    helper.layout = Layout(Div("email", "password1"), "password2")
+    fields = helper.filter(str, greedy=True)
+    helper[0].wrap(Fieldset, "legend")
+    fields.wrap(Field, css_class="field")
+    fields.update_attributes(placeholder="placeholder")
+
+    assert helper.layout[0][0][0][0] == "email"
+    assert helper.layout[0][0][1][0] == "password1"
+    assert helper.layout[1][0] == "password2"
+    for field in (helper.layout[0][0][0], helper.layout[0][0][1], helper.layout[1]):
+        assert field.attrs == {"class": "field", "placeholder": "placeholder"}
+
+
+def test_pointers_resolved_by_identity():
+    helper = FormHelper()
+    helper.layout = Layout("first_name", Div("email"), Div("password1"), "password2")
+    divs = helper.filter(Div)
+    password2 = helper["password2"]
+
+    helper[0:2].wrap_together(Div, css_class="together")
+    password2.wrap(Field, css_class="password2")
+    assert helper.layout[2].attrs == {"class": "password2"}
+    assert helper.layout[2][0] == "password2"
+    helper.layout.insert(0, "last_name")
+    password2.update_attributes(placeholder="password")
+    assert helper.layout[3].attrs == {"class": "password2", "placeholder": "password"}
+
+    # The first div was moved within another one
+    with pytest.raises(DynamicError):
+        divs.wrap(Field)
+
+
+def test_layout_batch():
+    helper = FormHelper()
+    helper.layout = Layout(Div("email", "password1"), "password2", "first_name")
+    version, div_version = helper.layout.version, helper.layout[0].version
+
+    with helper.layout.batch():
+        helper.filter(str, greedy=True).wrap(Field, css_class="field")
+        with helper.layout.batch():
+            helper[1:3].wrap_together(Div, css_class="names")
+        assert (helper.layout.version, helper.layout[0].version) == (version, div_version)
+        # Lookups see the changes made within the batch
+        assert helper["first_name"].slice == [Pointer([1, 1, 0], "first_name")]
+        helper.filter(Field, greedy=True).update_attributes(placeholder="placeholder")
+
+    assert helper.layout.version > version
+    assert helper.layout[0].version == helper.layout.version
+    assert helper.layout[1][1].attrs == {"class": "field", "placeholder": "placeholder"}
+
+
+def test_transform_layout():
+    calls = []
+
+    def customize_layout(helper):
+        calls.append(helper)
+        helper.filter(str, greedy=True).wrap(Field, css_class="field")
+        helper["email"].update_attributes(placeholder="email")
+        helper[0:2].wrap_together(Div, css_class="account")
+
+    key = (SampleForm, "test_transform_layout")
+    first_helper = FormHelper(SampleForm())
+    first_helper.transform_layout(key, customize_layout)
+    second_helper = FormHelper(SampleForm())
+    second_helper.transform_layout(key, customize_layout)
+
+    assert calls == [first_helper]
+    assert second_helper.layout is not first_helper.layout
+    assert second_helper.layout.fingerprint() == first_helper.layout.fingerprint()
+
+    # Layouts are independent copies
+    second_helper.filter(Field, greedy=True).update_attributes(css_class="second")
+    assert first_helper.layout[0][1].attrs == {"class": "field", "placeholder": "email"}
+    assert second_helper.layout[0][1].attrs == {"class": "field second", "placeholder": "email"}
+    assert not first_helper.layout[0].is_within(second_helper.layout)
+
+
+def test_transform_layout_helper_attributes():
+    def customize_layout(helper):
+        helper.form_id = "transformed"
+        helper.attrs["data-form"] = "sample"
+        helper.add_input(Submit("save", "Save"))
+        helper.filter(str, greedy=True).wrap(Field)
+
+    key = (SampleForm, "test_transform_layout_helper_attributes")
+    first_helper = FormHelper(SampleForm())
+    first_helper.transform_layout(key, customize_layout)
+    second_helper = FormHelper(SampleForm())
+    second_helper.transform_layout(key, customize_layout)
+
+    for helper in (first_helper, second_helper):
+        assert helper.form_id == "transformed"
+        assert helper.attrs == {"data-form": "sample"}
+        assert [input_object.name for input_object in helper.inputs] == ["save"]
+    assert render_crispy_form(SampleForm(), second_helper) == render_crispy_form(SampleForm(), first_helper)
+
+    # Attributes are copies too
+    second_helper.attrs["data-form"] = "second"
+    second_helper.inputs[0].field_classes = "second"
+    assert first_helper.attrs == {"data-form": "sample"}
+    assert first_helper.inputs[0].field_classes != "second"
+
+
+def test_transformed_layouts_bounded(monkeypatch):
+    monkeypatch.setattr("crispy_forms.helper.transformed_layouts", TemplateCache(maxsize=1))
+    calls = []
+
+    def customize_layout(helper):
+        calls.append(helper)
+        helper.filter(str, greedy=True).wrap(Field)
+
+    for key in ("first", "second", "first"):
+        FormHelper(SampleForm()).transform_layout(key, customize_layout)
+    assert len(calls) == 3
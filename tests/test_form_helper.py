@@ -9,7 +9,7 @@ from django.template import Context, Template, TemplateSyntaxError
 from django.urls import reverse
 
 from crispy_forms.bootstrap import AppendedText, FieldWithButtons, PrependedAppendedText, PrependedText, StrictButton
-from crispy_forms.helper import FormHelper, FormHelpersException
+from crispy_forms.helper import FormHelper, FormHelpersException, class_helper
 from crispy_forms.layout import Button, Hidden, Layout, Reset, Submit
 from crispy_forms.templatetags.crispy_forms_tags import CrispyFormNode
 from crispy_forms.utils import render_crispy_form
@@ -497,3 +497,68 @@ def test_passthrough_context():
     html = render_crispy_form(form, helper=form.helper, context=c)
     assert "Got prefix: foo" in html
     assert "Got suffix: bar" in html
+
+
+def test_with_overrides():
+    helper = FormHelper()
+    helper.form_id = "base-id"
+    helper.layout = Layout("email")
+    helper.add_input(Submit("save", "save"))
+
+    overlay = helper.with_overrides(form_id="overlay-id", form_method="GET")
+    overlay.add_input(Submit("cancel", "cancel"))
+    overlay.attrs["novalidate"] = True
+    assert overlay.layout is helper.layout
+    assert (overlay.form_id, overlay.form_method, len(overlay.inputs)) == ("overlay-id", "get", 2)
+    assert (helper.form_id, helper.form_method, len(helper.inputs), helper.attrs) == ("base-id", "post", 1, {})
+
+
+def test_class_helper():
+    calls = []
+
+    class HelperForm(forms.Form):
+        email = forms.CharField()
+
+        @class_helper
+        def helper(form_class):
+            calls.append(form_class)
+            helper = FormHelper()
+            helper.form_id = "class-helper"
+            helper.layout = Layout("email")
+            return helper
+
+    class OtherHelperForm(HelperForm):
+        pass
+
+    form = HelperForm()
+    assert form.helper is HelperForm().helper is HelperForm.helper
+    assert OtherHelperForm().helper is not form.helper
+    assert calls == [HelperForm, OtherHelperForm]
+
+    html = render_crispy_form(form)
+    assert 'id="class-helper"' in html
+    assert 'name="email"' in html
+
+
+def test_get_attributes_memoized(settings):
+    helper = FormHelper()
+    helper.form_action = "simpleAction"
+    attributes = helper.get_attributes("bootstrap3")
+    assert helper.get_attributes("bootstrap3") is attributes
+    assert attributes["attrs"]["action"] == reverse("simpleAction")
+
+    helper.form_id = "form-id"
+    helper.attrs["novalidate"] = True
+    assert helper.get_attributes("bootstrap3")["attrs"] == {
+        "action": reverse("simpleAction"),
+        "id": "form-id",
+        "novalidate": True,
+    }
+
+    node = CrispyFormNode("form", "helper")
+    assert node.get_response_dict(helper, {"csrf_token": "token"}, False)["csrf_token"] == "token"
+    assert "csrf_token" not in node.get_response_dict(helper, {}, False)
+
+    # Reversed URLs follow URL configuration changes
+    settings.ROOT_URLCONF = "tests.other_urls"
+    assert helper.get_attributes("bootstrap3")["attrs"]["action"] == "/other/action/"
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+
+def get_imported_modules(statement):
+    """
+    Returns the names of the modules imported when running `statement` after Django's
+    setup, in a new interpreter.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import django, sys; django.setup(); %s; print('\\n'.join(sys.modules))" % statement,
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "tests.test_settings"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.splitlines())
+
+
+def test_template_tags_imports():
+    modules = get_imported_modules("import crispy_forms.templatetags.crispy_forms_tags")
+    crispy_modules = {module for module in modules if module.startswith("crispy_forms")}
+
+    # Layout objects and the dynamic API are imported when used
+    assert "crispy_forms.templatetags.crispy_forms_tags" in crispy_modules
+    assert not crispy_modules & {"crispy_forms.layout", "crispy_forms.bootstrap", "crispy_forms.layout_slice"}
@@ -0,0 +1,92 @@
+import pytest
+from django.template import Context
+
+from crispy_forms.helper import FormHelper
+from crispy_forms.layout import Div, Layout
+from crispy_forms.utils import render_template_string
+
+from .forms import SampleForm
+
+pytest.importorskip("jinja2")
+
+
+@pytest.fixture
+def jinja2_engine():
+    from django.template.backends.jinja2 import Jinja2
+
+    return Jinja2(
+        {
+            "NAME": "jinja2",
+            "DIRS": [],
+            "APP_DIRS": False,
+            "OPTIONS": {"environment": "crispy_forms.jinja2.environment"},
+        }
+    )
+
+
+def test_crispy_global(jinja2_engine):
+    form = SampleForm()
+    form.helper = FormHelper()
+    form.helper.layout = Layout("email", "password1")
+    template = jinja2_engine.from_string("{{ crispy(form) }}{{ crispy(other_form, helper) }}")
+
+    # Forms keep track of the fields they rendered, each call gets its own form
+    html = template.render({"form": form, "other_form": SampleForm(), "helper": FormHelper()})
+    assert html.count('name="email"') == 2
+    assert html.count('name="password2"') == 1
+    assert "&lt;" not in html
+
+
+def test_crispy_filters(jinja2_engine):
+    form = SampleForm(data={})
+    template = jinja2_engine.from_string(
+        "{{ form|crispy }}{{ form|as_crispy_errors }}{{ form.email|as_crispy_field }}"
+    )
+
+    html = template.render({"form": form})
+    assert html.count('name="email"') == 2
+    assert "&lt;" not in html
+
+
+def test_template_code_rendered_by_engine(settings):
+    settings.TEMPLATES = settings.TEMPLATES + [
+        {
+            "BACKEND": "django.template.backends.jinja2.Jinja2",
+            "NAME": "jinja2",
+            "OPTIONS": {"environment": "crispy_forms.jinja2.environment"},
+        }
+    ]
+    settings.CRISPY_TEMPLATE_ENGINE = "jinja2"
+    assert render_template_string("{{ 'crispy' ~ '-' ~ name }}", Context({"name": "forms"})) == "crispy-forms"
+
+
+def test_layout_rendered_with_jinja2_templates(settings, tmp_path):
+    # A minimal template pack written as Jinja2 templates, using the field helpers
+    (tmp_path / "jinja_pack" / "layout").mkdir(parents=True)
+    (tmp_path / "jinja_pack" / "field.html").write_text(
+        '<p class="{{ field|css_class }}{% if field|is_checkbox %} checkbox{% endif %}">'
+        '{{ crispy_field(field, {"class": "input"}, placeholder=field.label) }}</p>'
+    )
+    (tmp_path / "jinja_pack" / "layout" / "div.html").write_text(
+        '<div class="{{ div.css_class }}"{{ div.flat_attrs }}>{{ fields }}</div>'
+    )
+    settings.TEMPLATES = settings.TEMPLATES + [
+        {
+            "BACKEND": "django.template.backends.jinja2.Jinja2",
+            "NAME": "jinja2",
+            "DIRS": [str(tmp_path)],
+            "OPTIONS": {"environment": "crispy_forms.jinja2.environment"},
+        }
+    ]
+    settings.CRISPY_TEMPLATE_ENGINE = "jinja2"
+
+    form = SampleForm()
+    form.crispy_field_template = None
+    helper = FormHelper()
+    helper.layout = Layout(Div("email", "is_company", css_class="fields", data_row="1"))
+    html = helper.render_layout(form, Context(), template_pack="jinja_pack")
+
+    assert html.startswith('<div class="fields" data-row="1"><p class="textinput"><input type="text" name="email"')
+    assert ' input" placeholder="email"' in html
+    assert '<p class="checkboxinput checkbox"><input type="checkbox" name="is_company"' in html
+    assert "&lt;" not in html
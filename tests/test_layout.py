@@ -1,3 +1,6 @@
+import asyncio
+from unittest.mock import patch
+
 import django
 import pytest
 from django import forms
@@ -10,8 +13,8 @@ from django.utils.translation import gettext_lazy as _
 
 from crispy_forms.bootstrap import Field, InlineCheckboxes
 from crispy_forms.helper import FormHelper
-from crispy_forms.layout import HTML, Column, Fieldset, Layout, Row
-from crispy_forms.utils import render_crispy_form
+from crispy_forms.layout import HTML, Column, Div, Fieldset, Layout, LayoutObject, Row, Submit, TemplateNameMixin
+from crispy_forms.utils import TEMPLATE_PACK, arender_crispy_form, render_crispy_form
 
 from .forms import (
     CheckboxesSampleForm,
@@ -364,3 +367,148 @@ def test_update_attributes_class():
     form.helper["password1"].update_attributes(css_class="hello2")
     html = render_crispy_form(form)
     assert html.count(' class="hello hello2') == 1
+
+
+def test_context_depth_does_not_grow_with_fields():
+    depths = []
+
+    class ContextDepth:
+        def render(self, form, context, **kwargs):
+            depths.append(len(context.dicts))
+            return ""
+
+    names = ["field_%s" % i for i in range(500)]
+    LargeForm = type("LargeForm", (forms.Form,), {name: forms.CharField() for name in names})
+    helper = FormHelper()
+    helper.layout = Layout(
+        ContextDepth(),
+        Fieldset("legend", *names[:200]),
+        Div(*(Field(name) for name in names[200:400])),
+        Row(*names[400:]),
+        Submit("save", "save"),
+        ContextDepth(),
+    )
+
+    context = Context({"form_show_errors": True, "form_show_labels": True})
+    depth = len(context.dicts)
+    helper.render_layout(LargeForm(), context)
+
+    assert depths == [depth, depth]
+    assert len(context.dicts) == depth
+
+
+def test_formset_context_depth_is_constant():
+    rendered = []
+
+    class ContextDepth:
+        def render(self, form, context, **kwargs):
+            rendered.append((context["formset_form"] is form, context["forloop"].counter, len(context.dicts)))
+            return ""
+
+    SampleFormSet = formset_factory(SampleForm, extra=50)
+    helper = FormHelper()
+    helper.layout = Layout(ContextDepth(), "email")
+
+    render_crispy_form(form=SampleFormSet(), helper=helper)
+
+    assert [(is_form, counter) for is_form, counter, _ in rendered] == [(True, i) for i in range(1, 51)]
+    assert len({depth for _, _, depth in rendered}) == 1
+
+
+def test_render_plan():
+    class Section(Div):
+        def render(self, form, context, template_pack=TEMPLATE_PACK, **kwargs):
+            return "<section>%s</section>" % self.get_rendered_fields(form, context, template_pack, **kwargs)
+
+    form = SampleForm()
+    form.helper = FormHelper()
+    form.helper.layout = layout = Layout(
+        Fieldset("{{ title }}", Row("email", css_class="emails")), Section("password1"), HTML("<hr>"), "password2"
+    )
+    html = render_crispy_form(form, context={"title": "Account"})
+    plan_form, render_form = SampleForm(), SampleForm()
+    plan_form.crispy_field_template = render_form.crispy_field_template = None
+    plan = layout.get_render_plan(TEMPLATE_PACK)
+    context = Context({"title": "Account"})
+    assert plan.render(plan_form, context) == layout.render(render_form, context, template_pack=TEMPLATE_PACK)
+    assert "<legend>Account</legend>" in html
+    assert "row emails" in html
+    assert "<section>" in html
+
+    # Templates of built-in layout objects were resolved when the plan was built
+    with patch.object(TemplateNameMixin, "get_template_name", side_effect=AssertionError):
+        assert render_crispy_form(form, context={"title": "Account"}) == html
+    assert layout.get_render_plan(TEMPLATE_PACK) is plan
+
+    # Modifying the layout, even its fields in place, builds a new plan
+    layout[0][0].css_class = "other"
+    assert "row other" in render_crispy_form(form, context={"title": "Account"})
+    layout.fields.append("first_name")
+    assert 'name="first_name"' in render_crispy_form(form, context={"title": "Account"})
+    assert layout.get_render_plan(TEMPLATE_PACK) is not plan
+
+
+def test_arender_crispy_form():
+    helper = FormHelper()
+    helper.layout = Layout(
+        Fieldset("{{ title }}", Row(Column("first_name"), Column("last_name"))),
+        Div("email", HTML("<p>{{ title }}</p>"), css_class="email"),
+        Submit("save", "save"),
+    )
+    context = {"title": "Names", "csrf_token": "aTestToken"}
+
+    html = asyncio.run(arender_crispy_form(SampleForm(), helper, context))
+    assert parse_html(html) == parse_html(render_crispy_form(SampleForm(), helper, context))
+
+    SampleFormSet = formset_factory(SampleForm, extra=2)
+    html = asyncio.run(arender_crispy_form(SampleFormSet(), helper, context))
+    assert parse_html(html) == parse_html(render_crispy_form(SampleFormSet(), helper, context))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_arender_crispy_form_model_choices():
+    from django.contrib.auth.models import Group
+
+    Group.objects.create(name="editors")
+
+    class GroupForm(forms.Form):
+        group = forms.ModelChoiceField(queryset=Group.objects.all())
+        groups = forms.ModelMultipleChoiceField(queryset=Group.objects.all())
+
+    helper = FormHelper()
+    helper.layout = Layout(Div("group"))
+    helper.render_unmentioned_fields = True
+
+    # Fields querying the database aren't rendered on the event loop
+    html = asyncio.run(arender_crispy_form(GroupForm(), helper))
+    assert html.count("editors") == 2
+    assert "editors" in asyncio.run(arender_crispy_form(GroupForm()))
+
+    GroupFormSet = formset_factory(GroupForm, extra=2)
+    assert asyncio.run(arender_crispy_form(GroupFormSet(), helper)).count("editors") == 4
+
+
+def test_arender_gathers_siblings():
+    class Waiting(LayoutObject):
+        def __init__(self, name, events):
+            self.name = name
+            self.events = events
+            self.fields = []
+
+        async def arender(self, form, context, **kwargs):
+            # Only completes if the other sibling is rendered concurrently
+            self.events[self.name].set()
+            other = "b" if self.name == "a" else "a"
+            await asyncio.wait_for(self.events[other].wait(), timeout=1)
+            return "<span>%s</span>" % self.name
+
+    async def render():
+        events = {"a": asyncio.Event(), "b": asyncio.Event()}
+        helper = FormHelper()
+        helper.layout = Layout(Div(Waiting("a", events), "email", Row(Waiting("b", events))))
+        return await arender_crispy_form(SampleForm(), helper)
+
+    html = asyncio.run(render())
+    assert "<span>a</span>" in html
+    assert "<span>b</span>" in html
+    assert html.index("<span>a</span>") < html.index('name="email"') < html.index("<span>b</span>")
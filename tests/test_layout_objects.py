@@ -1,3 +1,6 @@
+from unittest.mock import patch
+
+import pytest
 from django import forms
 from django.template import Context, Template
 from django.utils.translation import activate, deactivate
@@ -9,16 +12,31 @@ from crispy_forms.bootstrap import (
     Alert,
     AppendedText,
     Container,
+    FormActions,
     InlineCheckboxes,
     InlineRadios,
     PrependedAppendedText,
     PrependedText,
+    StrictButton,
     Tab,
     TabHolder,
 )
 from crispy_forms.helper import FormHelper
-from crispy_forms.layout import HTML, Field, Fieldset, Layout, MultiWidgetField
-from crispy_forms.utils import render_crispy_form
+from crispy_forms.layout import (
+    HTML,
+    ButtonHolder,
+    Column,
+    Div,
+    Field,
+    Fieldset,
+    Layout,
+    LayoutObject,
+    MultiField,
+    MultiWidgetField,
+    Row,
+    Submit,
+)
+from crispy_forms.utils import load_template, render_crispy_form
 
 from .forms import (
     CheckboxesSampleForm,
@@ -366,3 +384,70 @@ class TestBootstrapLayoutObjects:
         name = "テスト"
         test_container = Container(name, "val1", "val2")
         assert test_container.css_id == name
+
+    def test_rendering_leaves_layout_untouched(self):
+        class SampleForm(forms.Form):
+            val1 = forms.CharField(required=True)
+            val2 = forms.CharField(required=True)
+            helper = FormHelper()
+            helper.layout = Layout(
+                MultiField("multi", "val1"),
+                TabHolder(Tab("one", "val1"), Tab("two", "val2")),
+                Accordion(AccordionGroup("three", "val1"), AccordionGroup("four", "val2")),
+                Submit("{{ name }}", "Save {{ name }}"),
+                StrictButton("Go {{ name }}"),
+            )
+
+        multifield, tab_holder, accordion, submit, button = SampleForm.helper.layout
+        first = render_crispy_form(SampleForm(data={}), context={"name": "first"})
+        second = render_crispy_form(SampleForm(data={}), context={"name": "second"})
+
+        assert first.replace("first", "second") == second
+        # Render copies don't register as parents of the layout objects they share
+        with patch.object(LayoutObject, "_adopt", side_effect=AssertionError):
+            assert render_crispy_form(SampleForm(data={}), context={"name": "second"}) == second
+        assert multifield.css_class == "ctrlHolder"
+        assert not hasattr(multifield, "bound_fields")
+        assert [tab.active for tab in tab_holder] == [False, False]
+        assert [group.active for group in accordion] == [False, False]
+        assert [tab.css_class for tab in tab_holder] == ["tab-pane", "tab-pane"]
+        assert submit.value == "Save {{ name }}"
+        assert button.content == "Go {{ name }}"
+
+
+@pytest.mark.parametrize("template_pack", ["bootstrap3", "bootstrap4"])
+@pytest.mark.parametrize("form_horizontal", [False, True])
+def test_native_rendering(settings, template_pack, form_horizontal):
+    form = SampleForm()
+    form.helper = FormHelper()
+    form.helper.template_pack = template_pack
+    if form_horizontal:
+        form.helper.form_class = "form-horizontal"
+        form.helper.label_class = "col-lg-2"
+        form.helper.field_class = "col-lg-8"
+    form.helper.layout = Layout(
+        Div("email", Div("password1", css_id="inner", css_class="a <b>"), data_test="value"),
+        Row(Column("first_name"), Column("last_name", css_class="col-6", css_id="last")),
+        Row("password2", css_class="extra", data_row="1"),
+        Fieldset("Legend of {{ title }}", "is_company", css_class="fields", css_id="fieldset", data_set="1"),
+        Fieldset("", "datetime_field"),
+        ButtonHolder(Submit("save", "Save"), css_id="holder", css_class="holder"),
+        ButtonHolder(HTML("<b>&</b>")),
+        FormActions(Submit("send", "Send"), css_class="actions", css_id="actions", data_action="1"),
+        FormActions(HTML("<i>no attributes</i>")),
+        Fieldset("", "email", template="custom_fieldset_template_with_context.html"),
+    )
+    context = {"title": "<title>"}
+
+    settings.CRISPY_NATIVE_RENDERING = False
+    html = render_crispy_form(form, context=context)
+
+    settings.CRISPY_NATIVE_RENDERING = True
+    with patch("crispy_forms.layout.load_template", wraps=load_template) as mock_load_template:
+        assert render_crispy_form(form, context=context) == html
+    # Wrappers don't load their templates, overridden ones are still rendered
+    assert {call.args[0] for call in mock_load_template.call_args_list} == {
+        "%s/layout/baseinput.html" % template_pack,
+        "custom_fieldset_template_with_context.html",
+    }
+    assert "<h1>Special custom fieldset with context passthrough</h1>" in html
@@ -0,0 +1,50 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from crispy_forms.native import native_renderers
+
+# Values of the variables the wrapper templates are rendered with
+VARIANTS = {
+    "css_id": [None, "wrapper"],
+    "css_class": [None, "", "col-6", "a <b>"],
+    "flat_attrs": [mark_safe(""), mark_safe(' data-test="value"')],
+    "legend": ["", "Legend <i>"],
+    "label_class": ["", "col-lg-2"],
+    "field_class": ["", "col-lg-8"],
+    "form_class": ["", "form-horizontal"],
+}
+
+
+def get_contexts():
+    for values in itertools.product(*VARIANTS.values()):
+        variables = dict(zip(VARIANTS, values))
+        layout_object = SimpleNamespace(
+            css_id=variables["css_id"],
+            id=variables["css_id"],
+            css_class=variables["css_class"],
+            flat_attrs=variables["flat_attrs"],
+        )
+        fields = mark_safe('<input name="email">')
+        yield {
+            **variables,
+            "div": layout_object,
+            "buttonholder": layout_object,
+            "fieldset": layout_object,
+            "formactions": layout_object,
+            "fields": fields,
+            "fields_output": fields,
+        }
+
+
+@pytest.mark.parametrize("template_name", sorted(native_renderers))
+def test_native_renderer_matches_installed_template(template_name):
+    # Fails once the template of the installed template pack changes, the renderer must
+    # be updated then
+    template = get_template(template_name)
+    renderer = native_renderers[template_name]
+    for context in get_contexts():
+        assert renderer(context) == template.render(context), context
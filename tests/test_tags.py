@@ -1,10 +1,18 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
 import pytest
 from django.forms.boundfield import BoundField
 from django.forms.formsets import formset_factory
 from django.template import Context, Template
+from django.template.loaders.filesystem import Loader as FilesystemLoader
 
 from crispy_forms.exceptions import CrispyError
+from crispy_forms.helper import FormHelper
+from crispy_forms.layout import Layout
 from crispy_forms.templatetags.crispy_forms_field import crispy_addon
+from crispy_forms.utils import TEMPLATE_PACK, loaded_templates
 
 from .forms import SampleForm
 
@@ -216,3 +224,59 @@ def test_crispy_addon():
         crispy_addon()
     with pytest.raises(TypeError):
         crispy_addon(bound_field)
+
+
+def test_crispy_tag_concurrent_rendering():
+    # Nodes are shared between threads, as with the cached template loader under a threaded
+    # server. Both renders wait for each other halfway, so that they are interleaved.
+    template = Template("{% load crispy_forms_tags %}{% crispy form helper %}")
+    barrier = threading.Barrier(2)
+
+    class InterleavedFormHelper(FormHelper):
+        def get_attributes(self, template_pack=TEMPLATE_PACK):
+            if self.interleaved:
+                barrier.wait(timeout=5)
+            return super().get_attributes(template_pack=template_pack)
+
+    def render(template_pack, interleaved=True):
+        helper = InterleavedFormHelper()
+        helper.layout = Layout("email", "password1")
+        helper.template_pack = template_pack
+        helper.interleaved = interleaved
+        return template.render(Context({"form": SampleForm(), "helper": helper}))
+
+    template_packs = ["bootstrap3", "bootstrap4"]
+    expected = [render(template_pack, interleaved=False) for template_pack in template_packs]
+    for _ in range(5):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(render, template_packs)) == expected
+
+
+def test_crispy_tag_formset_leaves_helper_untouched():
+    SampleFormSet = formset_factory(SampleForm, extra=2)
+    helper = FormHelper()
+    helper.layout = Layout("email")
+    template = Template("{% load crispy_forms_tags %}{% crispy formset helper %}")
+
+    template.render(Context({"formset": SampleFormSet(), "helper": helper}))
+    assert helper.render_hidden_fields is False
+
+
+def test_templates_loaded_once():
+    template = Template(
+        """
+        {% load crispy_forms_tags %}
+        {{ form|crispy }}
+        {{ form|as_crispy_errors }}
+        {% for field in form %}{{ field|as_crispy_field }}{% endfor %}
+        {% crispy form %}
+    """
+    )
+    form = SampleForm(data={})
+    html = template.render(Context({"form": form}))
+    misses = loaded_templates.stats()["misses"]
+
+    # Templates are kept in loaded_templates, their files aren't read again
+    with patch.object(FilesystemLoader, "get_contents", side_effect=AssertionError):
+        assert template.render(Context({"form": form})) == html
+    assert loaded_templates.stats()["misses"] == misses
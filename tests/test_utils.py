@@ -1,18 +1,40 @@
+import asyncio
+import threading
+from pathlib import Path
+
 import django
 import pytest
 from django import forms
 from django.conf import settings
+from django.forms import formset_factory
 from django.template.base import Template
 from django.template.context import Context
 from django.test import override_settings
+from django.utils.autoreload import file_changed
+from django.utils.safestring import SafeString
 
 from crispy_forms.helper import FormHelper
-from crispy_forms.layout import Layout
+from crispy_forms.layout import HTML, Div, Fieldset, Layout
 from crispy_forms.templatetags.crispy_forms_filters import optgroups
-from crispy_forms.utils import get_template_pack, list_difference, list_intersection, render_field
+from crispy_forms.utils import (
+    TemplateCache,
+    aiter_render_crispy_form,
+    clear_loaded_templates,
+    compiled_templates,
+    default_field_template,
+    get_template_pack,
+    iter_render_crispy_form,
+    list_difference,
+    list_intersection,
+    load_template,
+    loaded_templates,
+    render_crispy_form,
+    render_field,
+    render_template_string,
+)
 
 from .forms import GroupedChoiceForm, SampleForm, SampleForm5
-from .utils import parse_expected, parse_form
+from .utils import parse_expected, parse_form, parse_html
 
 
 def test_list_intersection():
@@ -28,6 +50,124 @@ def test_render_field_with_none_field():
     assert rendered == ""
 
 
+def test_render_template_string():
+    compiled_templates.clear()
+    context = Context({"name": "crispy"})
+
+    assert render_template_string("Hello {{ name }}", context) == "Hello crispy"
+    assert render_template_string("Hello {{ name }}", context) == "Hello crispy"
+    assert compiled_templates.stats()["misses"] == 1
+    assert compiled_templates.stats()["hits"] == 1
+
+    # Strings without template syntax are not compiled
+    rendered = render_template_string("<b>Hello</b>", context)
+    assert rendered == "<b>Hello</b>"
+    assert isinstance(rendered, SafeString)
+    assert compiled_templates.stats()["size"] == 1
+
+
+@override_settings(CRISPY_TEMPLATE_ENGINE="django")
+def test_render_with_template_engine():
+    form = SampleForm()
+    helper = FormHelper()
+    helper.layout = Layout(HTML("<p>{{ name }}</p>"), "email")
+
+    html = render_crispy_form(form, helper, {"name": "crispy"})
+    assert "<p>crispy</p>" in html
+    assert 'name="email"' in html
+    assert render_template_string("Hello {{ name }}", Context({"name": "crispy"})) == "Hello crispy"
+
+
+def test_template_cache_eviction():
+    cache = TemplateCache(maxsize=2)
+    for source in ("a", "b", "a", "c"):
+        cache.get(source, lambda: Template("{{ %s }}" % source))
+
+    stats = cache.stats()
+    assert stats == {"hits": 1, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2}
+    # "b" was the least recently used template
+    cache.get("b", lambda: None)
+    assert cache.misses == 4
+
+
+def test_load_template():
+    clear_loaded_templates()
+    template = load_template("%s/field.html" % get_template_pack())
+    assert load_template("%s/field.html" % get_template_pack()) is template
+    assert default_field_template(get_template_pack()) is template
+    assert loaded_templates.stats()["hits"] == 2
+
+    with override_settings(CRISPY_TEMPLATE_ENGINE="django"):
+        # Templates are loaded again from the engine
+        assert loaded_templates.stats()["size"] == 0
+        load_template("%s/field.html" % get_template_pack())
+        assert loaded_templates.stats()["misses"] == 1
+        assert default_field_template(get_template_pack()) is not template
+        assert loaded_templates.stats()["hits"] == 1
+
+    # Changed templates are loaded again, edited modules restart the server
+    load_template("%s/field.html" % get_template_pack())
+    file_changed.send(sender=None, file_path=Path("forms.py"))
+    assert loaded_templates.stats()["size"] == 1
+    assert not any(response for _, response in file_changed.send(sender=None, file_path=Path("field.html")))
+    assert loaded_templates.stats()["size"] == 0
+
+
+def test_iter_render_crispy_form():
+    helper = FormHelper()
+    helper.layout = Layout(
+        Fieldset("{{ title }}", "first_name", "last_name"),
+        Div("email", css_class="email"),
+        HTML("<p>{{ forloop.counter }}</p>"),
+    )
+    context = {"title": "Names", "csrf_token": "aTestToken"}
+
+    chunks = list(iter_render_crispy_form(SampleForm(), helper, context))
+    # opening markup, three layout objects, closing markup
+    assert len(chunks) == 5
+    assert "first_name" in chunks[1] and "email" not in chunks[1]
+    assert parse_html("".join(chunks)) == parse_html(render_crispy_form(SampleForm(), helper, context))
+
+    SampleFormSet = formset_factory(SampleForm, extra=3)
+    chunks = list(iter_render_crispy_form(SampleFormSet(), helper, context))
+    assert len(chunks) == 1 + 3 * 4
+    assert parse_html("".join(chunks)) == parse_html(render_crispy_form(SampleFormSet(), helper, context))
+
+    async def collect():
+        return [chunk async for chunk in aiter_render_crispy_form(SampleFormSet(), helper, context)]
+
+    assert parse_html("".join(asyncio.run(collect()))) == parse_html("".join(chunks))
+
+
+def test_aiter_render_crispy_form_off_event_loop():
+    threads = []
+
+    class ThreadHTML(HTML):
+        def render(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return super().render(*args, **kwargs)
+
+    helper = FormHelper()
+    helper.layout = Layout(ThreadHTML("<p>first</p>"), "email", ThreadHTML("<p>last</p>"))
+
+    async def collect():
+        return threading.get_ident(), [chunk async for chunk in aiter_render_crispy_form(SampleForm(), helper)]
+
+    loop_thread, chunks = asyncio.run(collect())
+    assert chunks == list(iter_render_crispy_form(SampleForm(), helper))
+    assert len(threads) == 4
+    assert loop_thread not in threads[:2]
+
+
+def test_iter_render_crispy_form_without_layout():
+    class PlainForm(forms.Form):
+        name = forms.CharField()
+
+    chunks = list(iter_render_crispy_form(PlainForm()))
+    assert len(chunks) == 1
+    assert chunks[0] == render_crispy_form(PlainForm())
+
+
 def test_custom_bound_field():
     from django.forms.boundfield import BoundField
 
@@ -0,0 +1,34 @@
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.template.loaders.filesystem import Loader as FilesystemLoader
+
+from crispy_forms.utils import load_template
+from crispy_forms.warmup import get_pack_template_names, warm_up
+
+from .forms import SampleForm
+
+
+def test_warm_up():
+    template_names = get_pack_template_names("bootstrap4")
+    assert {"bootstrap4/field.html", "bootstrap4/uni_form.html", "bootstrap4/layout/div.html"} <= set(template_names)
+
+    warmed_up, failures = warm_up(["bootstrap4"], [SampleForm, "tests.forms.NonExistentForm"])
+    assert warmed_up == template_names + ["tests.forms.SampleForm"]
+    assert [name for name, _ in failures] == ["tests.forms.NonExistentForm"]
+    with patch.object(FilesystemLoader, "get_contents", side_effect=AssertionError):
+        for template_name in template_names:
+            load_template(template_name)
+
+
+def test_crispy_warmup_command():
+    stdout = StringIO()
+    call_command("crispy_warmup", "--pack", "bootstrap3", "--form", "tests.forms.SampleForm", stdout=stdout)
+    assert "Warmed up %s templates and forms." % (len(get_pack_template_names("bootstrap3")) + 1) in stdout.getvalue()
+
+    with pytest.raises(CommandError):
+        call_command(
+            "crispy_warmup", "--pack", "bootstrap3", "--form", "tests.forms.NonExistentForm", stderr=StringIO()
+        )